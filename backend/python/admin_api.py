@@ -30,7 +30,8 @@ from backend.python.middleware.rbac import (
     require_master_admin,
     require_validator,
     require_admin,
-    log_admin_action
+    log_admin_action,
+    invalidate_user_cache
 )
 
 # Import ActivityLogger for comprehensive activity tracking
@@ -341,6 +342,9 @@ async def update_user_role(
         
         updated_response = supabase.schema("gaia").from_("user_profiles").update(update_data).eq("id", user_id).execute()
         
+        # Apply the change to the user's next request instead of after the auth cache TTL
+        invalidate_user_cache(user_id)
+        
         # Log admin action (note: trigger will also log this)
         await log_admin_action(
             user=current_user,
@@ -413,6 +417,9 @@ async def deactivate_user(
         
         updated_response = supabase.schema("gaia").from_("user_profiles").update(update_data).eq("id", user_id).execute()
         
+        # Apply the change to the user's next request instead of after the auth cache TTL
+        invalidate_user_cache(user_id)
+        
         # Log admin action (note: trigger will also log this)
         await log_admin_action(
             user=current_user,
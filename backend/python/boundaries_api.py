@@ -15,7 +15,7 @@ from fastapi.responses import JSONResponse
 
 from philippine_regions import (
     get_region_from_location,
-    PHILIPPINE_ADMIN_MAPPING,
+    resolve_city,
     normalize_location_with_region
 )
 from backend.python.middleware.rate_limiter import limiter
@@ -93,21 +93,16 @@ async def get_location_boundary(location_name: str, request: Request):
     if not location_clean:
         raise HTTPException(status_code=400, detail="Invalid location name")
     
+    # Use the canonical city name (case/accent-insensitive) for boundary matching
+    city_key = resolve_city(location_clean)
+    if city_key is not None:
+        location_clean = city_key
+    
     # Try as city first, then as province
     region_data = get_region_from_location(city=location_clean)
     if not region_data:
         region_data = get_region_from_location(province=location_clean)
     
-    # Case-insensitive fallback
-    if not region_data:
-        for key in PHILIPPINE_ADMIN_MAPPING.keys():
-            if key.lower() == location_clean.lower():
-                region_data = get_region_from_location(city=key)
-                if not region_data:
-                    region_data = get_region_from_location(province=key)
-                location_clean = key
-                break
-    
     if not region_data:
         raise HTTPException(status_code=404, detail=f"Location '{location_name}' not found")
     
@@ -221,6 +221,55 @@ def process_single_feed_task(self, feed_id: str):
         raise self.retry(exc=e, countdown=30, max_retries=2)
 
 
+@celery_app.task(name='celery_worker.process_rss_urls_task', bind=True)
+def process_rss_urls_task(self, feed_urls: list):
+    """
+    Run the RSS hazard detection pipeline for a list of feed URLs.
+    Enqueued by the /api/v1/rss/process endpoint so classification and Geo-NER
+    run in the worker process instead of the API process.
+    
+    Args:
+        feed_urls: RSS feed URLs to process
+        
+    Returns:
+        dict: Processing summary
+    """
+    logger.info(f"Processing {len(feed_urls)} requested RSS feeds (Task ID: {self.request.id})")
+    
+    try:
+        from backend.python.pipeline.rss_processor import rss_processor
+        import asyncio
+        
+        rss_processor.set_feeds(feed_urls)
+        
+        # Stream hazards one at a time instead of holding every feed's results
+        stats = {}
+        
+        async def consume_hazards():
+            async for hazard in rss_processor.iter_hazards(stats):
+                logger.debug(f"Detected hazard: {hazard['title']}")
+        
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(consume_hazards())
+        loop.close()
+        
+        logger.info(f"✅ RSS processing task completed: {stats['feeds_processed']} feeds processed, "
+                   f"{stats['hazards_found']} hazards found")
+        
+        return {
+            'status': 'completed',
+            'feeds_processed': stats['feeds_processed'],
+            'hazards_found': stats['hazards_found'],
+            'errors': stats['errors'],
+            'processed_at': datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error in RSS URL processing task: {str(e)}", exc_info=True)
+        raise self.retry(exc=e, countdown=30, max_retries=2)
+
+
 # ============================================================================
 # CELERY EVENTS
 # ============================================================================
@@ -5,19 +5,21 @@ Handles public hazard report submission with Cloudflare Turnstile verification
 """
 
 import os
+import asyncio
 import logging
 import sys
 import uuid
 from datetime import datetime
 from typing import Optional, Dict
+from urllib.parse import quote
 import httpx
-from fastapi import APIRouter, File, Form, UploadFile, HTTPException, status, Request
+from fastapi import APIRouter, BackgroundTasks, File, Form, UploadFile, HTTPException, status, Request
 from pydantic import BaseModel, Field, validator
 
 # Add parent directory to path for lib imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from lib.supabase_client import supabase
+from lib.supabase_client import supabase, SUPABASE_URL
 
 # Import ActivityLogger for comprehensive activity tracking
 from backend.python.middleware.activity_logger import ActivityLogger
@@ -30,7 +32,13 @@ from backend.python.models.geo_ner import geo_ner
 from backend.python.utils.phone_validation import is_valid_philippine_phone_number
 
 # Import shared geocoding utility (async version for FastAPI endpoints)
-from backend.python.utils.geocoding import get_coordinates_from_nominatim_async
+from backend.python.utils.geocoding import (
+    get_coordinates_from_nominatim_async,
+    PH_LAT_MIN,
+    PH_LAT_MAX,
+    PH_LON_MIN,
+    PH_LON_MAX,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +48,17 @@ router = APIRouter(prefix="/citizen-reports", tags=["Citizen Reports"])
 # Supabase client imported from centralized configuration
 logger.info("✓ Supabase client initialized for citizen reports")
 
+# Security: whitelisted image upload types
+ALLOWED_EXTENSIONS = frozenset({'jpg', 'jpeg', 'png', 'gif', 'webp'})
+ALLOWED_MIME_TYPES = frozenset({'image/jpeg', 'image/jpg', 'image/png', 'image/gif', 'image/webp'})
+MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+
+# Columns returned by /track (avoids pulling image_metadata and other admin-only fields)
+TRACKING_COLUMNS = (
+    "tracking_id,status,hazard_type,location_name,description,"
+    "submitted_at,verified_at,confidence_score,notes"
+)
+
 # =============================================================================
 # PYDANTIC MODELS
 # =============================================================================
@@ -132,6 +151,26 @@ async def verify_turnstile(token: str, remoteip: Optional[str] = None) -> dict:
         )
 
 
+# =============================================================================
+# STORAGE HELPERS
+# =============================================================================
+
+def _upload_report_image(path: str, content: bytes, content_type: str):
+    """
+    Upload a validated report image to Supabase Storage (blocking, run in a thread)
+    
+    Args:
+        path: Server-controlled storage path inside the bucket
+        content: Raw image bytes
+        content_type: MIME type sent to Storage
+    """
+    return supabase.storage.from_("citizen-report-images").upload(
+        path=path,
+        file=content,
+        file_options={"content-type": content_type}
+    )
+
+
 # =============================================================================
 # API ENDPOINTS
 # =============================================================================
@@ -139,6 +178,7 @@ async def verify_turnstile(token: str, remoteip: Optional[str] = None) -> dict:
 @router.post("/submit", response_model=ReportSubmissionResponse, status_code=status.HTTP_201_CREATED)
 async def submit_citizen_report(
     request: Request,
+    background_tasks: BackgroundTasks,
     # captcha_token: str = Form(..., description="Cloudflare Turnstile token"),  # TEMPORARILY DISABLED
     captcha_token: Optional[str] = Form(None, description="Cloudflare Turnstile token (optional)"),
     hazard_type: str = Form(..., description="Type of hazard"),
@@ -202,6 +242,18 @@ async def submit_citizen_report(
             detail="Please provide a valid Philippine phone number (e.g., 09123456789, +63 912 345 6789)"
         )
     
+    # Validate user-supplied coordinates against Philippine boundaries (4-21°N, 116-127°E)
+    # up-front, so out-of-bounds input is rejected before any AI or geocoding work
+    has_user_coordinates = latitude is not None and longitude is not None
+    if has_user_coordinates and not (
+        PH_LAT_MIN <= latitude <= PH_LAT_MAX and PH_LON_MIN <= longitude <= PH_LON_MAX
+    ):
+        logger.warning("Coordinates outside Philippine boundaries submitted.")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Coordinates outside Philippine boundaries"
+        )
+    
     # 1. Verify Turnstile - TEMPORARILY DISABLED
     # try:
     #     if captcha_token:
@@ -223,7 +275,7 @@ async def submit_citizen_report(
     ai_confidence = 0.0
     extracted_latitude = None
     extracted_longitude = None
-    coordinates_source = "user" if (latitude is not None and longitude is not None) else None
+    coordinates_source = "user" if has_user_coordinates else None
     
     try:
         # Combine location_name and description for better context
@@ -242,7 +294,7 @@ async def submit_citizen_report(
         
         # Coordinate Extraction: Use Nominatim API for accurate map pinning
         # This replaces the previous GeoNER-based coordinate extraction process
-        if latitude is None or longitude is None:
+        if not has_user_coordinates:
             logger.info(f"Extracting coordinates using Nominatim API from location name: {location_name}")
             try:
                 # Step 1: Identify Input - Extract location string from report data
@@ -256,6 +308,7 @@ async def submit_citizen_report(
                     # - Extracting lat/lon from the first result
                     coords = await get_coordinates_from_nominatim_async(location_name)
                     
+                    # The geocoder only returns results inside Philippine bounds
                     if coords and 'latitude' in coords and 'longitude' in coords:
                         extracted_latitude = coords['latitude']
                         extracted_longitude = coords['longitude']
@@ -276,48 +329,39 @@ async def submit_citizen_report(
         # Don't fail the submission if AI processing fails - continue with user-provided data
     
     # 3. Use Nominatim-extracted coordinates if user didn't provide them
-    final_latitude = latitude if latitude is not None else extracted_latitude
-    final_longitude = longitude if longitude is not None else extracted_longitude
-    
-    # 4. Validate Philippine boundaries (4-21°N, 116-127°E) - only if coordinates available
-    if final_latitude is not None and final_longitude is not None:
-        if not (4 <= final_latitude <= 21 and 116 <= final_longitude <= 127):
-            logger.warning("Coordinates outside Philippine boundaries submitted.")
-            # Reset to None if outside boundaries (for Nominatim or other extracted coordinates)
-            if coordinates_source in ["nominatim_geocoded", "ai_extracted"]:
-                final_latitude = None
-                final_longitude = None
-                coordinates_source = None
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Coordinates outside Philippine boundaries"
-                )
+    # 4. Both sources are already inside Philippine boundaries: user coordinates were
+    #    validated above and the geocoder discards out-of-bounds results
+    if has_user_coordinates:
+        final_latitude, final_longitude = latitude, longitude
+    else:
+        final_latitude, final_longitude = extracted_latitude, extracted_longitude
     
     # 5. Generate unique tracking ID
-    tracking_id = f"CR{datetime.utcnow().strftime('%Y%m%d')}{str(uuid.uuid4())[:8].upper()}"
+    # Capture the submission time once so tracking_id, submitted_at, created_at
+    # and the AI processing timestamp all agree
+    now = datetime.utcnow()
+    now_iso = now.isoformat()
+    tracking_id = f"CR{now.strftime('%Y%m%d')}{uuid.uuid4().hex[:8].upper()}"
     
     # 6. Handle image upload (if provided)
     image_url = None
     image_metadata = None
+    image_upload = None  # (path, content, content_type) once the image passes validation
     
     if image and image.filename:
         try:
             # Security: Validate file type and extension
-            ALLOWED_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif', 'webp'}
-            ALLOWED_MIME_TYPES = {'image/jpeg', 'image/jpg', 'image/png', 'image/gif', 'image/webp'}
-            
             # Validate MIME type
             if image.content_type and image.content_type not in ALLOWED_MIME_TYPES:
                 raise ValueError(f"Invalid file type: {image.content_type}. Only images are allowed.")
             
             # Sanitize and validate file extension
             original_filename = image.filename.lower()
-            file_extension = original_filename.split('.')[-1] if '.' in original_filename else 'jpg'
+            file_extension = original_filename.rpartition('.')[2] if '.' in original_filename else 'jpg'
             
             # Security: Whitelist file extensions to prevent executable uploads
             if file_extension not in ALLOWED_EXTENSIONS:
-                raise ValueError(f"Invalid file extension: {file_extension}. Allowed: {', '.join(ALLOWED_EXTENSIONS)}")
+                raise ValueError(f"Invalid file extension: {file_extension}. Allowed: {', '.join(sorted(ALLOWED_EXTENSIONS))}")
             
             # Security: Generate safe filename - use tracking_id (server-generated) + validated extension
             # This prevents path traversal attacks since tracking_id is server-controlled
@@ -327,33 +371,26 @@ async def submit_citizen_report(
             if '..' in unique_filename or '/' not in unique_filename or unique_filename.startswith('/'):
                 raise ValueError("Invalid filename format detected")
             
+            # Security: Validate file size (5MB limit) - reject oversize uploads from the
+            # spooled size before reading the body; re-check after reading when size is unknown
+            if image.size is not None and image.size > MAX_FILE_SIZE:
+                raise ValueError(f"File size exceeds {MAX_FILE_SIZE / (1024*1024)}MB limit")
+            
             # Read image content
             image_content = await image.read()
             
-            # Security: Validate file size (5MB limit)
-            MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
-            if len(image_content) > MAX_FILE_SIZE:
+            if image.size is None and len(image_content) > MAX_FILE_SIZE:
                 raise ValueError(f"File size exceeds {MAX_FILE_SIZE / (1024*1024)}MB limit")
             
-            # Upload to Supabase Storage
-            storage_response = supabase.storage.from_("citizen-report-images").upload(
-                path=unique_filename,
-                file=image_content,
-                file_options={"content-type": image.content_type or "image/jpeg"}
-            )
-            
+            # The public URL is deterministic from the server-controlled path, so it is
+            # built up-front and the Storage upload runs alongside the DB insert (step 7)
             # Get public URL - manually construct with proper URL encoding for security
             # Format: {SUPABASE_URL}/storage/v1/object/public/{bucket}/{path}
-            from lib.supabase_client import SUPABASE_URL
-            from urllib.parse import quote
-            
             # Security: URL encode the path to prevent injection attacks
             # The bucket name is hardcoded, and path is server-controlled, so this is safe
             encoded_path = quote(unique_filename, safe='/')  # Keep '/' for path structure
             image_url = f"{SUPABASE_URL}/storage/v1/object/public/citizen-report-images/{encoded_path}"
             
-            # Verify the URL was generated correctly
-            logger.info(f"Image uploaded successfully: {unique_filename}")
             logger.debug(f"Image public URL: {image_url}")
             
             image_metadata = {
@@ -362,6 +399,7 @@ async def submit_citizen_report(
                 "size": len(image_content),
                 "stored_path": unique_filename  # Store server-controlled path
             }
+            image_upload = (unique_filename, image_content, image.content_type or "image/jpeg")
             
         except ValueError as e:
             # Security: Don't expose internal errors, log them instead
@@ -401,8 +439,8 @@ async def submit_citizen_report(
             "status": "unverified",
             # "recaptcha_score": recaptcha_result.get("score", 0.0),  # TEMPORARILY DISABLED
             "captcha_token": "<TOKEN PLACEHOLDER>",  # Edit This when re-enabling CAPTCHA
-            "submitted_at": datetime.utcnow().isoformat(),
-            "created_at": datetime.utcnow().isoformat()
+            "submitted_at": now_iso,
+            "created_at": now_iso
         }
         
         # Add coordinates if available (from user or AI extraction)
@@ -417,7 +455,7 @@ async def submit_citizen_report(
             "ai_hazard_type": ai_hazard_type,
             "ai_confidence": ai_confidence,
             "coordinates_source": coordinates_source,
-            "ai_processing_timestamp": datetime.utcnow().isoformat()
+            "ai_processing_timestamp": now_iso
         }
         
         if image_metadata:
@@ -427,15 +465,45 @@ async def submit_citizen_report(
         
         report_data["image_metadata"] = image_metadata
         
-        result = supabase.schema("gaia").from_("citizen_reports").insert(report_data).execute()
+        insert_query = supabase.schema("gaia").from_("citizen_reports").insert(report_data)
+        
+        if image_upload:
+            # Upload and insert are independent once image_url is known - run them together
+            upload_outcome, result = await asyncio.gather(
+                asyncio.to_thread(_upload_report_image, *image_upload),
+                asyncio.to_thread(insert_query.execute),
+                return_exceptions=True
+            )
+            if isinstance(result, BaseException):
+                raise result
+        else:
+            upload_outcome = None
+            result = await asyncio.to_thread(insert_query.execute)
         
         if not result.data:
             raise Exception("Database insert failed - no data returned")
         
+        if isinstance(upload_outcome, BaseException):
+            # Compensate: the row was written with an image_url that does not exist
+            logger.error(f"Image upload failed: {upload_outcome}")
+            image_metadata["error"] = "Upload failed"
+            try:
+                await asyncio.to_thread(
+                    supabase.schema("gaia").from_("citizen_reports")
+                    .update({"image_url": None, "image_metadata": image_metadata})
+                    .eq("tracking_id", tracking_id)
+                    .execute
+                )
+            except Exception as e:
+                logger.error(f"Failed to clear image_url for {tracking_id}: {e}")
+        elif image_upload:
+            logger.info(f"Image uploaded successfully: {image_upload[0]}")
+        
         logger.info(f"Citizen report created: {tracking_id}")
-        # Log public submission activity (anonymous user)
+        # Log public submission activity (anonymous user) after the response is sent
         try:
-            await ActivityLogger.log_activity(
+            background_tasks.add_task(
+                ActivityLogger.log_activity,
                 user_context=None,
                 action="SUBMIT_CITIZEN_REPORT",
                 request=request,
@@ -461,7 +529,7 @@ async def submit_citizen_report(
             tracking_id=tracking_id,
             message="Thank you for your report! It will be reviewed by authorities.",
             status="pending_verification",
-            submitted_at=datetime.utcnow()
+            submitted_at=now
         )
         
     except Exception as e:
@@ -473,7 +541,7 @@ async def submit_citizen_report(
 
 
 @router.get("/track/{tracking_id}", response_model=ReportTrackingResponse)
-async def track_citizen_report(tracking_id: str, request: Request):
+async def track_citizen_report(tracking_id: str, request: Request, background_tasks: BackgroundTasks):
     """
     Track the status of a submitted citizen report
     
@@ -489,9 +557,9 @@ async def track_citizen_report(tracking_id: str, request: Request):
         )
     
     try:
-        # Query report by tracking ID
+        # Query report by tracking ID - only the columns ReportTrackingResponse needs
         result = supabase.schema("gaia").from_("citizen_reports") \
-            .select("*") \
+            .select(TRACKING_COLUMNS) \
             .eq("tracking_id", tracking_id) \
             .execute()
         
@@ -503,9 +571,10 @@ async def track_citizen_report(tracking_id: str, request: Request):
         
         report = result.data[0]
 
-        # Log report tracking/view action (anonymous/public)
+        # Log report tracking/view action (anonymous/public) after the response is sent
         try:
-            await ActivityLogger.log_activity(
+            background_tasks.add_task(
+                ActivityLogger.log_activity,
                 user_context=None,
                 action="VIEW_REPORT_TRACK",
                 request=request,
@@ -4,8 +4,11 @@ Geospatial AI-driven Assessment - Environmental Hazard Detection
 """
 
 import os
+import asyncio
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Response
@@ -23,6 +26,9 @@ from backend.python.models.classifier import classifier
 from backend.python.models.geo_ner import geo_ner
 from backend.python.pipeline.rss_processor import rss_processor
 
+# Celery task for offloading RSS processing to the worker process
+from backend.python.celery_worker import process_rss_urls_task
+
 # Import research API router (commented out until Supabase configured)
 # from backend.python.research_api import router as research_router
 
@@ -46,6 +52,8 @@ from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from backend.python.middleware.rate_limiter import limiter, rate_limit_exceeded_handler
 from backend.python.middleware.security_headers import SecurityHeadersMiddleware
+from backend.python.middleware.log_writer import log_writer
+from backend.python.middleware.rbac import load_role_permissions
 
 # Configure logging
 logging.basicConfig(
@@ -54,11 +62,43 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+def start_log_listener() -> QueueListener:
+    """
+    Move the root logger's handlers behind a queue.
+    
+    Log calls on the event loop only enqueue the record; formatting and
+    stdout/file writes happen on the listener's background thread.
+    """
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    log_queue = queue.SimpleQueue()
+    
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    listener.start()
+    return listener
+
+
+def stop_log_listener(listener: QueueListener) -> None:
+    """Drain queued records and give the handlers back to the root logger"""
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, QueueHandler):
+            root.removeHandler(handler)
+    listener.stop()
+    for handler in listener.handlers:
+        root.addHandler(handler)
+
+
 # Lifespan event handler (replaces deprecated @app.on_event)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Load AI models on startup, cleanup on shutdown"""
     # Startup
+    log_listener = start_log_listener()
     logger.info("Starting GAIA Backend...")
     logger.info("Loading AI models...")
 
@@ -71,6 +111,12 @@ async def lifespan(app: FastAPI):
         geo_ner.load_model()
         logger.info("✓ Geo-NER model loaded")
 
+        # Start batched activity/audit log writer
+        log_writer.start()
+
+        # Warm the RBAC role -> permissions map
+        await load_role_permissions()
+
         logger.info("GAIA Backend ready!")
         logger.info(f"Environment: {ENV}")
         logger.info(f"Port: {os.getenv('PORT', '8000')}")
@@ -78,6 +124,7 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error loading models: {str(e)}")
         logger.error("Backend startup failed - check model loading and environment variables")
+        stop_log_listener(log_listener)
         raise
 
     yield  # Application runs here
@@ -85,6 +132,12 @@ async def lifespan(app: FastAPI):
     # Shutdown (cleanup if needed)
     logger.info("Shutting down GAIA Backend...")
 
+    # Flush pending activity/audit log rows
+    await log_writer.stop()
+
+    # Flush queued log records
+    stop_log_listener(log_listener)
+
 # Initialize FastAPI application with lifespan handler
 app = FastAPI(
     title="GAIA API",
@@ -341,24 +394,41 @@ async def process_rss_feeds(request: ProcessRSSRequest, background_tasks: Backgr
     Triggers background processing of feeds with AI pipeline.
     Returns immediately with task started confirmation.
     
-    **IMPORTANT**: This endpoint returns immediately and processes feeds in the background
-    to prevent blocking other API requests. Check processing status via logs or database.
+    **IMPORTANT**: This endpoint returns immediately and processes feeds in the Celery
+    worker so CPU-heavy classification doesn't slow down other API requests. If the
+    broker is unreachable, processing falls back to an in-process background task.
+    Check processing status via logs or database.
     """
     try:
         # Set feeds
         feeds_to_process = request.feeds if request.feeds else rss_processor.DEFAULT_FEEDS
         
-        # Add background task (non-blocking)
-        async def process_feeds_background():
-            try:
-                rss_processor.set_feeds(feeds_to_process)
-                results = await rss_processor.process_all_feeds()
-                logger.info(f"✅ Background RSS processing completed: {len(results)} feeds processed")
-                return results
-            except Exception as e:
-                logger.error(f"❌ Background RSS processing error: {str(e)}", exc_info=True)
-        
-        background_tasks.add_task(process_feeds_background)
+        try:
+            # Enqueue on the Celery worker (publishing is blocking - run off the event loop)
+            await asyncio.to_thread(
+                process_rss_urls_task.apply_async,
+                args=[feeds_to_process],
+                retry=False,  # Fail fast so the fallback below kicks in
+                ignore_result=True  # Results are logged by the worker, not polled here
+            )
+            logger.info(f"Enqueued RSS processing for {len(feeds_to_process)} feeds")
+        except Exception as e:
+            logger.warning(f"Celery broker unavailable ({str(e)}); processing feeds in-process")
+            
+            # Add background task (non-blocking)
+            async def process_feeds_background():
+                try:
+                    rss_processor.set_feeds(feeds_to_process)
+                    # Stream hazards one at a time instead of holding every feed's results
+                    stats = {}
+                    async for hazard in rss_processor.iter_hazards(stats):
+                        logger.debug(f"Detected hazard: {hazard['title']}")
+                    logger.info(f"✅ Background RSS processing completed: {stats['feeds_processed']} feeds processed, "
+                               f"{stats['hazards_found']} hazards found")
+                except Exception as e:
+                    logger.error(f"❌ Background RSS processing error: {str(e)}", exc_info=True)
+            
+            background_tasks.add_task(process_feeds_background)
         
         # Return immediately with task started status
         return {
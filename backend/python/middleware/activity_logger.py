@@ -5,17 +5,30 @@ Centralized logging for all user actions and system events
 Module: AC-05 (Session and Activity Logger)
 Tables: gaia.activity_logs, gaia.audit_logs
 Security: IP tracking, user agent logging, request validation
+
+Rows are queued on the shared log_writer and inserted in batches by its
+background flusher (started in main.py lifespan). Helpers that write both an
+activity and an audit row queue them together so they land in the same flush.
 """
 
+import asyncio
 import logging
 from typing import Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from fastapi import Request
-from backend.python.lib.supabase_client import supabase
 from backend.python.middleware.rbac import UserContext
+from backend.python.middleware.log_writer import log_writer
+from backend.python.middleware.client_info import get_client_info
 
 logger = logging.getLogger(__name__)
 
+# Auth action -> (status, severity, message verb) for log_user_auth
+_AUTH_ACTIONS = {
+    "LOGIN": ("success", "info", "login"),
+    "LOGOUT": ("success", "info", "logout"),
+    "FAILED_LOGIN": ("failure", "warning", "failed login"),
+}
+
 
 class ActivityLogger:
     """
@@ -64,13 +77,7 @@ class ActivityLogger:
         """
         try:
             # Extract IP and user agent
-            ip_address = None
-            user_agent = None
-
-            if request:
-                forwarded = request.headers.get("X-Forwarded-For")
-                ip_address = forwarded.split(",")[0] if forwarded else request.client.host
-                user_agent = request.headers.get("User-Agent")
+            ip_address, user_agent = get_client_info(request)
             
             # Build activity log entry
             # Allow logging for anonymous/public actions (user_context may be None)
@@ -98,18 +105,16 @@ class ActivityLogger:
                 "details": details or {},
                 "ip_address": ip_address,
                 "user_agent": user_agent,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
-            # Insert into activity_logs table
-            response = supabase.schema("gaia").from_("activity_logs").insert(log_entry).execute()
+            # Queue for batched insert into activity_logs table
+            queued = await log_writer.put("activity_logs", log_entry)
             
-            if response.data:
-                logger.info(f"Activity logged: {user_email} - {action}")
-                return True
-            else:
-                logger.warning(f"Activity log returned no data: {action}")
-                return False
+            # The row itself is the record - only echo it when debugging
+            if queued and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Activity logged: %s - %s", user_email, action)
+            return queued
                 
         except Exception as e:
             logger.error(f"Failed to log activity: {str(e)}")
@@ -145,12 +150,8 @@ class ActivityLogger:
             bool: True if logged successfully
         """
         try:
-            # Extract IP and user agent
-            ip_address = None
-            
-            if request:
-                forwarded = request.headers.get("X-Forwarded-For")
-                ip_address = forwarded.split(",")[0] if forwarded else request.client.host
+            # Extract IP
+            ip_address, _ = get_client_info(request)
             
             # Build audit log entry
             log_entry = {
@@ -164,18 +165,15 @@ class ActivityLogger:
                 "message": message,
                 "metadata": metadata or {},
                 "ip_address": ip_address,
-                "created_at": datetime.utcnow().isoformat()
+                "created_at": datetime.now(timezone.utc).isoformat()
             }
             
-            # Insert into audit_logs table
-            response = supabase.schema("gaia").from_("audit_logs").insert(log_entry).execute()
+            # Queue for batched insert into audit_logs table
+            queued = await log_writer.put("audit_logs", log_entry)
             
-            if response.data:
-                logger.info(f"Audit logged: {action} - {status}")
-                return True
-            else:
-                logger.warning(f"Audit log returned no data: {action}")
-                return False
+            if queued and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Audit logged: %s - %s", action, status)
+            return queued
                 
         except Exception as e:
             logger.error(f"Failed to log audit event: {str(e)}")
@@ -237,32 +235,37 @@ class ActivityLogger:
         """
         action = "VALIDATE_HAZARD" if validated else "REJECT_HAZARD"
         
-        await ActivityLogger.log_activity(
-            user_context=validator,
-            action=action,
-            resource_type="hazard",
-            resource_id=hazard_id,
-            details={
-                "validated": validated,
-                "confidence_score": confidence_score,
-                "notes": notes
-            }
-        )
+        details = {
+            "validated": validated,
+            "confidence_score": confidence_score,
+            "notes": notes
+        }
         
-        return await ActivityLogger.log_audit(
-            user_context=validator,
-            action=action,
-            resource=f"hazard:{hazard_id}",
-            status="success",
-            event_type="user_action",
-            severity="info",
-            message=f"Hazard {'validated' if validated else 'rejected'} with confidence {confidence_score}",
-            metadata={
-                "hazard_id": hazard_id,
-                "validated": validated,
-                "confidence_score": confidence_score
-            }
+        # Queue both rows together so they go out in the same flush
+        _, audited = await asyncio.gather(
+            ActivityLogger.log_activity(
+                user_context=validator,
+                action=action,
+                resource_type="hazard",
+                resource_id=hazard_id,
+                details=details
+            ),
+            ActivityLogger.log_audit(
+                user_context=validator,
+                action=action,
+                resource=f"hazard:{hazard_id}",
+                status="success",
+                event_type="user_action",
+                severity="info",
+                message=f"Hazard {'validated' if validated else 'rejected'} with confidence {confidence_score}",
+                metadata={
+                    "hazard_id": hazard_id,
+                    "validated": validated,
+                    "confidence_score": confidence_score
+                }
+            )
         )
+        return audited
     
     @staticmethod
     async def log_config_change(
@@ -285,34 +288,35 @@ class ActivityLogger:
         Returns:
             bool: True if logged successfully
         """
-        await ActivityLogger.log_activity(
-            user_context=admin,
-            action="UPDATE_CONFIG",
-            request=request,
-            resource_type="system_config",
-            resource_id=config_key,
-            details={
-                "config_key": config_key,
-                "old_value": str(old_value),
-                "new_value": str(new_value)
-            }
-        )
+        change = {
+            "config_key": config_key,
+            "old_value": str(old_value),
+            "new_value": str(new_value)
+        }
         
-        return await ActivityLogger.log_audit(
-            user_context=admin,
-            action="UPDATE_CONFIG",
-            resource=f"system_config:{config_key}",
-            status="success",
-            event_type="user_action",
-            severity="warning",  # Config changes are important
-            message=f"Configuration '{config_key}' changed from {old_value} to {new_value}",
-            metadata={
-                "config_key": config_key,
-                "old_value": str(old_value),
-                "new_value": str(new_value)
-            },
-            request=request
+        # Queue both rows together so they go out in the same flush
+        _, audited = await asyncio.gather(
+            ActivityLogger.log_activity(
+                user_context=admin,
+                action="UPDATE_CONFIG",
+                request=request,
+                resource_type="system_config",
+                resource_id=config_key,
+                details=change
+            ),
+            ActivityLogger.log_audit(
+                user_context=admin,
+                action="UPDATE_CONFIG",
+                resource=f"system_config:{config_key}",
+                status="success",
+                event_type="user_action",
+                severity="warning",  # Config changes are important
+                message=f"Configuration '{config_key}' changed from {old_value} to {new_value}",
+                metadata=change,
+                request=request
+            )
         )
+        return audited
     
     @staticmethod
     async def log_user_auth(
@@ -336,18 +340,21 @@ class ActivityLogger:
             bool: True if logged successfully
         """
         try:
-            # Extract IP and user agent
-            ip_address = None
-            user_agent = None
+            # Extract IP
+            ip_address, _ = get_client_info(request)
             
-            if request:
-                forwarded = request.headers.get("X-Forwarded-For")
-                ip_address = forwarded.split(",")[0] if forwarded else request.client.host
-                user_agent = request.headers.get("User-Agent")
+            # Determine status, severity and message verb
+            auth_action = _AUTH_ACTIONS.get(action)
+            if auth_action:
+                status, severity, verb = auth_action
+            else:
+                status, severity, verb = "success", "info", action.lower().replace("_", " ")
             
-            # Determine status and severity
-            status = "success" if action != "FAILED_LOGIN" else "failure"
-            severity = "info" if status == "success" else "warning"
+            message = f"User {verb}: {user_email}"
+            metadata = {"user_email": user_email, "action": action}
+            if reason:
+                message = f"{message} - {reason}"
+                metadata["reason"] = reason
             
             # Log to audit_logs (auth events are security-relevant)
             log_entry = {
@@ -358,24 +365,17 @@ class ActivityLogger:
                 "action": action,
                 "resource": "authentication",
                 "status": status,
-                "message": f"User {action.lower().replace('_', ' ')}: {user_email}" + (f" - {reason}" if reason else ""),
-                "metadata": {
-                    "user_email": user_email,
-                    "action": action,
-                    "reason": reason
-                } if reason else {"user_email": user_email, "action": action},
+                "message": message,
+                "metadata": metadata,
                 "ip_address": ip_address,
-                "created_at": datetime.utcnow().isoformat()
+                "created_at": datetime.now(timezone.utc).isoformat()
             }
             
-            response = supabase.schema("gaia").from_("audit_logs").insert(log_entry).execute()
+            queued = await log_writer.put("audit_logs", log_entry)
             
-            if response.data:
-                logger.info(f"Auth event logged: {user_email} - {action}")
-                return True
-            else:
-                logger.warning(f"Auth log returned no data: {action}")
-                return False
+            if queued and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Auth event logged: %s - %s", user_email, action)
+            return queued
                 
         except Exception as e:
             logger.error(f"Failed to log auth event: {str(e)}")
@@ -0,0 +1,60 @@
+"""
+Client Info Helper for GAIA
+Resolves the client IP address and user agent of a request for logging.
+
+Module: AC-05 (Session and Activity Logger)
+Security: IP tracking, user agent logging
+
+The result is stored on request.state, so an endpoint that writes several log
+rows (e.g. hazard validation writes an activity and an audit row) parses the
+X-Forwarded-For header only once.
+"""
+
+from typing import Optional, Tuple
+
+from fastapi import Request
+
+
+def get_client_info(request: Optional[Request]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Get the client IP address and user agent of a request.
+
+    Args:
+        request: FastAPI request object (None for background/system events)
+
+    Returns:
+        tuple: (ip_address, user_agent), both None without a request
+    """
+    if request is None:
+        return None, None
+
+    state = request.state
+    client_info = getattr(state, "client_info", None)
+    if client_info is None:
+        # One pass over the raw ASGI headers (names are already lowercase bytes)
+        # instead of two case-insensitive Headers lookups
+        forwarded = None
+        user_agent = None
+        for name, value in request.scope.get("headers", ()):
+            if name == b"x-forwarded-for":
+                if forwarded is None:
+                    forwarded = value
+            elif name == b"user-agent":
+                if user_agent is None:
+                    user_agent = value
+            else:
+                continue
+            if forwarded is not None and user_agent is not None:
+                break
+
+        # Behind a proxy the first X-Forwarded-For entry is the original client
+        ip_address = forwarded.partition(b",")[0].strip().decode("latin-1") if forwarded else None
+        if not ip_address:
+            # scope["client"] is a (host, port) pair or None
+            client = request.scope.get("client")
+            ip_address = client[0] if client else None
+
+        client_info = (ip_address, user_agent.decode("latin-1") if user_agent is not None else None)
+        state.client_info = client_info
+
+    return client_info
@@ -0,0 +1,250 @@
+"""
+Batched Log Writer for GAIA
+Buffers activity/audit log rows in memory and writes them to Supabase in bulk.
+
+Module: AC-05 (Session and Activity Logger)
+Tables: gaia.activity_logs, gaia.audit_logs
+
+Each row used to be a single-row INSERT on the request path. Rows are now queued
+and a background flusher drains up to LOG_BATCH_MAX rows (or whatever arrived
+within LOG_FLUSH_INTERVAL seconds), grouped into one bulk INSERT per table.
+
+Usage:
+    # FastAPI lifespan (main.py)
+    log_writer.start()
+    ...
+    await log_writer.stop()  # flushes pending rows
+
+    # Queue a row
+    await log_writer.put("activity_logs", log_entry)
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+from postgrest.types import ReturnMethod
+
+from backend.python.lib.supabase_client import supabase
+
+logger = logging.getLogger(__name__)
+
+# schema() builds a new PostgREST client (and HTTP connection pool) per call,
+# so bind the gaia schema once and reuse its connections
+gaia = supabase.schema("gaia")
+
+# Flush when this many rows are buffered, or after this many seconds
+LOG_BATCH_MAX = 200
+LOG_FLUSH_INTERVAL = 0.5
+
+# Bound on queued rows, and what put() does once it is reached:
+#   block - wait for the flusher to make room (default, no row is lost)
+#   write - insert the row directly, bypassing the queue
+#   drop  - discard the row and count it
+LOG_MAX_PENDING = 10_000
+LOG_OVERFLOW_POLICY = os.getenv("LOG_OVERFLOW_POLICY", "block")
+OVERFLOW_POLICIES = ("block", "write", "drop")
+
+
+class BatchedLogWriter:
+    """
+    Queue-backed bulk writer for log tables in the gaia schema.
+
+    When the flusher is not running (scripts, Celery tasks, tests) rows are
+    written immediately so no log entry is lost.
+    """
+
+    def __init__(
+        self,
+        batch_max: int = LOG_BATCH_MAX,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+        max_pending: int = LOG_MAX_PENDING,
+        overflow_policy: str = LOG_OVERFLOW_POLICY
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            batch_max: Maximum rows written per flush
+            flush_interval: Maximum seconds a row waits before being flushed
+            max_pending: Maximum queued rows before overflow_policy applies
+            overflow_policy: One of OVERFLOW_POLICIES
+
+        Raises:
+            ValueError: If overflow_policy is not recognised
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow_policy '{overflow_policy}', expected one of {OVERFLOW_POLICIES}")
+        self.batch_max = batch_max
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.overflow_policy = overflow_policy
+        self.dropped_rows = 0
+        self.overflow_writes = 0
+        self.blocked_puts = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """True while the background flusher task is alive"""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background flusher (must be called inside the event loop)"""
+        if self.running:
+            return
+        # +1 leaves room for the stop() sentinel
+        self._queue = asyncio.Queue(maxsize=self.max_pending + 1)
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Log writer started (batch_max={self.batch_max}, flush_interval={self.flush_interval}s)")
+
+    async def stop(self) -> None:
+        """Stop the flusher and write every pending row"""
+        if self.running:
+            # Sentinel: the flusher writes its current batch and exits
+            await self._queue.put(None)
+            await self._task
+        await self.flush()
+        self._queue = None
+        self._task = None
+        logger.info("Log writer stopped")
+
+    async def put(self, table: str, row: Dict) -> bool:
+        """
+        Queue a row for insertion into gaia.<table>.
+
+        Args:
+            table: Table name in the gaia schema
+            row: Row to insert
+
+        Returns:
+            bool: True if queued or written, False if written unsuccessfully or dropped
+        """
+        if not self.running:
+            return await self._write(table, [row])
+
+        if self._queue.qsize() >= self.max_pending:
+            # Database is falling behind - don't grow memory without bound
+            if self.overflow_policy == "drop":
+                self.dropped_rows += 1
+                if self.dropped_rows % 1000 == 1:
+                    logger.warning(f"Log queue full ({self.max_pending} rows pending), "
+                                   f"dropping rows ({self.dropped_rows} dropped so far)")
+                return False
+            if self.overflow_policy == "write":
+                self.overflow_writes += 1
+                return await self._write(table, [row])
+            self.blocked_puts += 1
+            if self.blocked_puts % 1000 == 1:
+                logger.warning(f"Log queue full ({self.max_pending} rows pending), waiting for flush "
+                               f"({self.blocked_puts} blocked puts so far)")
+
+        await self._queue.put((table, row))
+        return True
+
+    def get_statistics(self) -> Dict:
+        """
+        Get writer queue statistics.
+
+        Returns:
+            dict: Queue depth, limits and overflow counters
+        """
+        return {
+            'running': self.running,
+            'pending_rows': self._queue.qsize() if self._queue is not None else 0,
+            'max_pending': self.max_pending,
+            'overflow_policy': self.overflow_policy,
+            'dropped_rows': self.dropped_rows,
+            'overflow_writes': self.overflow_writes,
+            'blocked_puts': self.blocked_puts,
+        }
+
+    async def flush(self) -> None:
+        """Write every row currently in the queue (used on shutdown and in tests)"""
+        if self._queue is None:
+            return
+        batch = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None:
+                batch.append(item)
+        if batch:
+            await self._write_batch(batch)
+
+    async def _run(self) -> None:
+        """Flusher loop: collect up to batch_max rows or flush_interval seconds, then write"""
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            stopping = False
+
+            while len(batch) < self.batch_max:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._write_batch(batch)
+            if stopping:
+                return
+
+    async def _write_batch(self, batch: List[Tuple[str, Dict]]) -> None:
+        """Group queued rows by table and write one bulk INSERT per table"""
+        grouped: Dict[str, List[Dict]] = {}
+        for table, row in batch:
+            grouped.setdefault(table, []).append(row)
+
+        for table, rows in grouped.items():
+            await self._write(table, rows)
+
+    async def _write(self, table: str, rows: List[Dict]) -> bool:
+        """
+        Insert rows into gaia.<table>.
+
+        If a bulk insert fails, rows are retried one at a time so a single bad
+        row doesn't lose the rest of the batch.
+
+        Returns:
+            bool: True if every row was inserted
+        """
+        try:
+            # supabase-py is synchronous: run the request in a worker thread so the
+            # event loop keeps serving requests, and skip echoing inserted rows back.
+            # Rows of one table can have different keys (e.g. log_audit vs
+            # log_admin_action), so missing columns take their defaults, not NULL
+            query = gaia.from_(table).insert(
+                rows,
+                returning=ReturnMethod.minimal,
+                default_to_null=False
+            )
+            await asyncio.to_thread(query.execute)
+            logger.debug(f"Flushed {len(rows)} row(s) to {table}")
+            return True
+        except Exception as e:
+            # Don't raise - log write failures shouldn't affect request handling
+            if len(rows) == 1:
+                logger.error(f"Failed to write row to {table}: {str(e)}")
+                return False
+            logger.warning(f"Bulk insert of {len(rows)} row(s) into {table} failed ({str(e)}), "
+                           f"retrying one by one")
+
+        results = [await self._write(table, [row]) for row in rows]
+        return all(results)
+
+
+# Global log writer instance (shared by ActivityLogger and audit helpers)
+log_writer = BatchedLogWriter()
@@ -11,14 +11,24 @@ from slowapi.errors import RateLimitExceeded
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+# Shared counter storage: Redis keeps limits correct across multiple uvicorn workers.
+# Without REDIS_URL (local development) counters live in process memory.
+RATE_LIMIT_STORAGE_URI = os.getenv("REDIS_URL") or "memory://"
+
 # Initialize rate limiter
 limiter = Limiter(
     key_func=get_remote_address,
     default_limits=["100/hour"],  # Default: 100 requests per hour per IP
-    storage_uri="memory://",  # In-memory storage (use Redis in production)
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    storage_options=(
+        {"max_connections": 32} if RATE_LIMIT_STORAGE_URI.startswith("redis") else {}
+    ),
+    in_memory_fallback_enabled=True,  # Keep limiting in-process if Redis is unreachable
+    strategy="moving-window",  # No double-quota bursts at fixed window boundaries
     headers_enabled=True,  # Add X-RateLimit-* headers to responses
 )
 
@@ -5,30 +5,50 @@ Provides decorators and dependencies for FastAPI endpoints requiring specific ro
 Supports: AC-03 (RBAC Authorization), UM-02 (Role Assignment), AUTH-REQ-08 (RBAC Integration)
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import Optional, List
-from functools import wraps
+import time
+from typing import Dict, FrozenSet, Iterable, Optional
+from functools import lru_cache, wraps
 from enum import Enum
 
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from cachetools import TTLCache
 import os
 import sys
 
-from realtime import Field
-
 # Add parent directory to path for lib imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from lib.supabase_client import supabase
+from backend.python.middleware.client_info import get_client_info
+from backend.python.middleware.log_writer import log_writer
 
 logger = logging.getLogger(__name__)
 
 # Supabase client imported from centralized configuration
+# schema() builds a new PostgREST client (and HTTP connection pool) per call,
+# so bind the gaia schema once and reuse its connections
+gaia = supabase.schema("gaia")
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
+# Authentication lookup cache: token hash -> UserContext fields.
+# The cache is per process: invalidate_user_cache() only clears the worker that
+# handled the admin request, so every other worker keeps serving the old role /
+# status for up to USER_CACHE_TTL seconds after a change or deactivation. Keep
+# this short - it bounds how long a deactivated or demoted user keeps access.
+USER_CACHE_TTL = 5  # seconds
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=USER_CACHE_TTL)
+
+# Role -> permissions map (gaia.role_permissions rarely changes)
+ROLE_PERMISSIONS_TTL = 300  # seconds
+_role_permissions: Dict["UserRole", FrozenSet[str]] = {}
+_role_permissions_loaded_at: Optional[float] = None
+
 
 # ============================================================================
 # Role Enum (matches database user_role type)
@@ -57,6 +77,18 @@ class UserStatus(str, Enum):
 class UserContext:
     """Authenticated user context with role and permissions"""
     
+    # Created on every authenticated request - slots avoid a per-instance __dict__
+    __slots__ = (
+        "user_id",
+        "email",
+        "role",
+        "status",
+        "full_name",
+        "organization",
+        "permissions",
+        "_audit_fields",
+    )
+    
     def __init__(
         self,
         user_id: str,
@@ -65,7 +97,7 @@ class UserContext:
         status: UserStatus,
         full_name: Optional[str] = None,
         organization: Optional[str] = None,
-        permissions: Optional[List[str]] = None
+        permissions: Optional[Iterable[str]] = None
     ):
         self.user_id = user_id
         self.email = email
@@ -73,7 +105,20 @@ class UserContext:
         self.status = status
         self.full_name = full_name
         self.organization = organization
-        self.permissions = permissions or []
+        # frozenset: O(1) has_permission checks (no copy if already a frozenset)
+        self.permissions: FrozenSet[str] = frozenset(permissions or ())
+        self._audit_fields: Optional[Dict[str, str]] = None
+    
+    @property
+    def audit_fields(self) -> Dict[str, str]:
+        """user_id/user_email/user_role columns for audit rows (built on first use)"""
+        if self._audit_fields is None:
+            self._audit_fields = {
+                "user_id": self.user_id,
+                "user_email": self.email,
+                "user_role": self.role.value,
+            }
+        return self._audit_fields
     
     def has_role(self, *roles: UserRole) -> bool:
         """Check if user has any of the specified roles"""
@@ -95,6 +140,74 @@ class UserContext:
 # Authentication & Authorization Functions
 # ============================================================================
 
+def _token_cache_key(token: str) -> str:
+    """Cache key for a bearer token (never store raw tokens in memory caches)"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def invalidate_user_cache(user_id: Optional[str] = None) -> None:
+    """
+    Drop cached authentication results.
+    
+    Call after changing a user's role or status so the change applies on the
+    next request instead of after USER_CACHE_TTL seconds. Only this process's
+    cache is cleared; other workers pick the change up when their entries
+    expire (at most USER_CACHE_TTL seconds).
+    
+    Args:
+        user_id: Only drop entries for this user (None clears everything)
+    """
+    if user_id is None:
+        _user_cache.clear()
+        return
+    for key, cached in list(_user_cache.items()):
+        if cached["user_id"] == user_id:
+            _user_cache.pop(key, None)
+
+
+async def load_role_permissions() -> bool:
+    """
+    Load gaia.role_permissions into the in-memory role -> permissions map.
+    
+    Called at startup (main.py lifespan) and again by get_current_user once the
+    map is older than ROLE_PERMISSIONS_TTL seconds.
+    
+    Returns:
+        bool: True if the map was loaded
+    """
+    global _role_permissions, _role_permissions_loaded_at
+    try:
+        response = await asyncio.to_thread(
+            gaia.from_("role_permissions").select("role, permission_name").execute
+        )
+        
+        grouped: Dict[UserRole, set] = {role: set() for role in UserRole}
+        for row in response.data or []:
+            try:
+                grouped[UserRole(row["role"])].add(row["permission_name"])
+            except ValueError:
+                continue
+        
+        _role_permissions = {role: frozenset(perms) for role, perms in grouped.items()}
+        _role_permissions_loaded_at = time.monotonic()
+        logger.info(f"Loaded role permissions for {len(_role_permissions)} roles")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to load role permissions: {str(e)}")
+        return False
+
+
+async def _get_role_permissions_map() -> Optional[Dict[UserRole, FrozenSet[str]]]:
+    """Return the role -> permissions map, reloading it when stale (None if unavailable)"""
+    if (
+        _role_permissions_loaded_at is None
+        or time.monotonic() - _role_permissions_loaded_at > ROLE_PERMISSIONS_TTL
+    ):
+        if not await load_role_permissions():
+            return None
+    return _role_permissions
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> UserContext:
@@ -103,12 +216,22 @@ async def get_current_user(
     
     This dependency can be used in any endpoint that requires authentication.
     For role-specific endpoints, use require_role() or specific decorators.
+    
+    Successful lookups are cached per token and per process for USER_CACHE_TTL
+    seconds, so a role or status change can take up to that long to reach
+    workers other than the one that called invalidate_user_cache().
     """
     token = credentials.credentials
+    cache_key = _token_cache_key(token)
+    
+    # Cache reads/writes happen without awaiting in between, so no lock is needed
+    cached = _user_cache.get(cache_key)
+    if cached is not None:
+        return UserContext(**cached)
     
     try:
-        # Verify token with Supabase Auth
-        response = supabase.auth.get_user(token)
+        # Verify token with Supabase Auth (blocking client - run off the event loop)
+        response = await asyncio.to_thread(supabase.auth.get_user, token)
         
         if not response or not response.user:
             raise HTTPException(
@@ -121,10 +244,17 @@ async def get_current_user(
         user_id = user.id
         email = user.email
         
-        # Fetch user profile with role from database (gaia schema)
-        profile_response = supabase.schema("gaia").from_("user_profiles").select(
-            "role, status, full_name, organization"
-        ).eq("id", user_id).execute()
+        # Permissions come from the in-memory role map; the RPC only joins
+        # role_permissions when that map could not be loaded
+        role_permissions = await _get_role_permissions_map()
+        
+        # Fetch user profile with role (gaia schema)
+        profile_response = await asyncio.to_thread(
+            gaia.rpc(
+                "get_user_context",
+                {"uid": user_id, "include_permissions": role_permissions is None}
+            ).execute
+        )
         
         if not profile_response.data:
             logger.warning(f"User {email} authenticated but no profile found in database")
@@ -144,23 +274,24 @@ async def get_current_user(
                 detail=f"Account is {user_status.value}. Contact administrator.",
             )
         
-        # Fetch user permissions from role_permissions table (gaia schema)
-        permissions_response = supabase.schema("gaia").from_("role_permissions").select(
-            "permission_name"
-        ).eq("role", user_role.value).execute()
+        if role_permissions is not None:
+            permissions = role_permissions.get(user_role, frozenset())
+        else:
+            permissions = frozenset(profile.get("permissions") or ())
         
-        permissions = [p["permission_name"] for p in permissions_response.data]
+        user_fields = {
+            "user_id": user_id,
+            "email": email,
+            "role": user_role,
+            "status": user_status,
+            "full_name": profile.get("full_name"),
+            "organization": profile.get("organization"),
+            "permissions": permissions
+        }
+        _user_cache[cache_key] = user_fields
         
         # Create UserContext
-        user_context = UserContext(
-            user_id=user_id,
-            email=email,
-            role=user_role,
-            status=user_status,
-            full_name=profile.get("full_name"),
-            organization=profile.get("organization"),
-            permissions=permissions
-        )
+        user_context = UserContext(**user_fields)
         
         logger.info(f"Authenticated user: {email} ({user_role.value})")
         return user_context
@@ -180,30 +311,45 @@ def require_role(*allowed_roles: UserRole):
     """
     Dependency factory that checks if authenticated user has one of the allowed roles.
     
+    The same role set always returns the same checker function, so FastAPI
+    resolves it once per request even when several dependencies share it.
+    
     Usage:
         @router.get("/admin/users")
         async def get_users(user: UserContext = Depends(require_role(UserRole.MASTER_ADMIN, UserRole.VALIDATOR))):
             ...
     """
+    return _role_checker_for(frozenset(allowed_roles))
+
+
+@lru_cache(maxsize=64)
+def _role_checker_for(allowed_roles: FrozenSet[UserRole]):
+    """Build (once per role set) the dependency returned by require_role()"""
+    # Keep the enum declaration order for stable log/error messages
+    role_names = [r.value for r in UserRole if r in allowed_roles]
+    
     async def role_checker(user: UserContext = Depends(get_current_user)) -> UserContext:
-        if not user.has_role(*allowed_roles):
+        if user.role not in allowed_roles:
             logger.warning(
                 f"Access denied: User {user.email} ({user.role.value}) attempted to access "
-                f"endpoint requiring roles: {[r.value for r in allowed_roles]}"
+                f"endpoint requiring roles: {role_names}"
             )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access denied. Required role: {' or '.join([r.value for r in allowed_roles])}",
+                detail=f"Access denied. Required role: {' or '.join(role_names)}",
             )
         return user
     
     return role_checker
 
 
+@lru_cache(maxsize=64)
 def require_permission(permission: str):
     """
     Dependency factory that checks if authenticated user has a specific permission.
     
+    Cached per permission name, so repeated calls return the same checker.
+    
     Usage:
         @router.patch("/admin/config/{key}")
         async def update_config(
@@ -281,23 +427,15 @@ async def log_admin_action(
     Log administrative actions to audit_logs table.
     
     This function is called after admin operations to maintain audit trail (AC-05).
+    The row is queued on log_writer and inserted with the next batched flush.
     """
     try:
-        # Extract IP address and user agent from request
-        ip_address = None
-        user_agent = None
-        
-        if request:
-            # Get client IP (handle proxies)
-            forwarded = request.headers.get("X-Forwarded-For")
-            ip_address = forwarded.split(",")[0] if forwarded else request.client.host
-            user_agent = request.headers.get("User-Agent")
+        # Extract IP address and user agent from request (handles proxies)
+        ip_address, user_agent = get_client_info(request)
         
-        # Insert audit log
-        supabase.schema("gaia").from_("audit_logs").insert({
-            "user_id": user.user_id,
-            "user_email": user.email,
-            "user_role": user.role.value,
+        # Queue audit log for batched insert
+        queued = await log_writer.put("audit_logs", {
+            **user.audit_fields,
             "action": action,
             "action_description": action_description,
             "resource_type": resource_type,
@@ -311,9 +449,11 @@ async def log_admin_action(
             "event_type": event_type,
             "severity": severity,
             "status": status
-        }).execute()
+        })
         
-        logger.info(f"Audit log: {user.email} - {action} - {action_description}")
+        # The row itself is the audit record - only echo it when debugging
+        if queued and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Audit log: %s - %s - %s", user.email, action, action_description)
         
     except Exception as e:
         logger.error(f"Failed to log audit event: {str(e)}")
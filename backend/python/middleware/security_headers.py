@@ -3,18 +3,19 @@ Security Headers Middleware for GAIA API
 Implements security headers following OWASP recommendations.
 
 Security Recommendation: SECURITY_AUDIT.md #5 (Medium Priority)
+
+Implemented as a plain ASGI middleware: it only rewrites the headers of the
+http.response.start message, so it avoids BaseHTTPMiddleware's per-request
+Request/Response wrapping and response body streaming task.
 """
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-from typing import Callable
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """
     Adds security headers to all HTTP responses.
     
@@ -29,13 +30,13 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         hsts_seconds: int = 31536000,  # 1 year
         csp_policy: str = None,
         frame_options: str = "DENY",
         enable_hsts: bool = True,
     ):
-        super().__init__(app)
+        self.app = app
         self.hsts_seconds = hsts_seconds
         self.frame_options = frame_options
         self.enable_hsts = enable_hsts
@@ -50,55 +51,67 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             "connect-src 'self' https://*.supabase.co; "
             "frame-ancestors 'none';"
         )
-    
-    async def dispatch(
-        self, request: Request, call_next: Callable
-    ) -> Response:
-        """
-        Add security headers to response.
-        """
-        response = await call_next(request)
-        
-        # X-Content-Type-Options: Prevent MIME sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        
-        # X-Frame-Options: Prevent clickjacking
-        response.headers["X-Frame-Options"] = self.frame_options
         
-        # X-XSS-Protection: Enable XSS filter (legacy browsers)
-        response.headers["X-XSS-Protection"] = "1; mode=block"
+        # Header values never change per request - build them once (raw ASGI form)
+        self.static_headers = [
+            # X-Content-Type-Options: Prevent MIME sniffing
+            (b"x-content-type-options", b"nosniff"),
+            # X-Frame-Options: Prevent clickjacking
+            (b"x-frame-options", self.frame_options.encode("latin-1")),
+            # X-XSS-Protection: Enable XSS filter (legacy browsers)
+            (b"x-xss-protection", b"1; mode=block"),
+            # Content-Security-Policy: Restrict resource loading
+            (b"content-security-policy", self.csp_policy.encode("latin-1")),
+            # Referrer-Policy: Control referrer information
+            (b"referrer-policy", b"strict-origin-when-cross-origin"),
+            # Permissions-Policy: Restrict browser features
+            (b"permissions-policy", (
+                b"geolocation=(self), "
+                b"microphone=(), "
+                b"camera=(), "
+                b"payment=(), "
+                b"usb=(), "
+                b"magnetometer=(), "
+                b"gyroscope=(), "
+                b"accelerometer=()"
+            )),
+        ]
         
-        # Strict-Transport-Security: Enforce HTTPS (only in production)
-        if self.enable_hsts and request.url.scheme == "https":
-            response.headers["Strict-Transport-Security"] = (
-                f"max-age={self.hsts_seconds}; includeSubDomains; preload"
-            )
+        # Strict-Transport-Security: Enforce HTTPS (only in production, HTTPS requests)
+        self.https_headers = self.static_headers + [
+            (b"strict-transport-security",
+             f"max-age={self.hsts_seconds}; includeSubDomains; preload".encode("latin-1")),
+        ]
         
-        # Content-Security-Policy: Restrict resource loading
-        response.headers["Content-Security-Policy"] = self.csp_policy
-        
-        # Referrer-Policy: Control referrer information
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        
-        # Permissions-Policy: Restrict browser features
-        response.headers["Permissions-Policy"] = (
-            "geolocation=(self), "
-            "microphone=(), "
-            "camera=(), "
-            "payment=(), "
-            "usb=(), "
-            "magnetometer=(), "
-            "gyroscope=(), "
-            "accelerometer=()"
-        )
+        # Header names replaced by ours, plus Server (information leakage)
+        self.static_names = frozenset(name for name, _ in self.static_headers) | {b"server"}
+        self.https_names = frozenset(name for name, _ in self.https_headers) | {b"server"}
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Add security headers to the response start message.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Remove server information leakage (use del for MutableHeaders)
-        if "Server" in response.headers:
-            del response.headers["Server"]
+        if self.enable_hsts and scope.get("scheme") == "https":
+            extra_headers, replaced_names = self.https_headers, self.https_names
+        else:
+            extra_headers, replaced_names = self.static_headers, self.static_names
         
-        logger.debug(f"Added security headers to {request.url.path}")
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = [
+                    (name, value)
+                    for name, value in message.get("headers", ())
+                    if name.lower() not in replaced_names
+                ]
+                headers.extend(extra_headers)
+                message["headers"] = headers
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_with_headers)
 
 
 # Production-ready configuration
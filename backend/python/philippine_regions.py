@@ -6,17 +6,39 @@ Supports Geo-NER location enrichment with regional context.
 Adapted from GeoAware with enhancements for GAIA's Supabase integration.
 """
 
-from typing import Dict, Optional, List
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, List, Tuple
 import logging
+import unicodedata
 
 logger = logging.getLogger(__name__)
 
+__all__ = [
+    'PHILIPPINE_ADMIN_MAPPING',
+    'PROVINCE_TO_REGION',
+    'REGION_TO_CITIES',
+    'REGION_TO_PROVINCES',
+    'PROVINCE_TO_CITIES',
+    'get_region_from_location',
+    'resolve_city',
+    'resolve_province',
+    'get_region_by_province',
+    'normalize_location_with_region',
+    'get_all_cities',
+    'get_all_provinces',
+    'get_all_regions',
+    'get_cities_by_region',
+    'get_provinces_by_region',
+    'get_cities_by_province',
+]
+
 
 # ============================================================================
 # Comprehensive Philippine Administrative Mapping
 # ============================================================================
 
-PHILIPPINE_ADMIN_MAPPING: Dict[str, Dict[str, str]] = {
+_PHILIPPINE_ADMIN_MAPPING_RAW: Dict[str, Dict[str, str]] = {
     # NCR - National Capital Region
     "Manila": {"province": "Metro Manila", "region": "NCR", "region_name": "National Capital Region"},
     "Quezon City": {"province": "Metro Manila", "region": "NCR", "region_name": "National Capital Region"},
@@ -207,7 +229,7 @@ PHILIPPINE_ADMIN_MAPPING: Dict[str, Dict[str, str]] = {
 # Province to Region Mapping for Quick Lookup
 # ============================================================================
 
-PROVINCE_TO_REGION: Dict[str, Dict[str, str]] = {
+_PROVINCE_TO_REGION_RAW: Dict[str, Dict[str, str]] = {
     "Metro Manila": {"region": "NCR", "region_name": "National Capital Region"},
     "Abra": {"region": "CAR", "region_name": "Cordillera Administrative Region"},
     "Benguet": {"region": "CAR", "region_name": "Cordillera Administrative Region"},
@@ -292,6 +314,78 @@ PROVINCE_TO_REGION: Dict[str, Dict[str, str]] = {
 }
 
 
+# ============================================================================
+# Lookup Indexes (built once at import)
+# ============================================================================
+
+def _share_records(mapping: Dict[str, Dict[str, str]]) -> None:
+    """
+    Point keys with identical records at a single shared dict.
+    
+    Most entries repeat their province's record (e.g. 17 NCR cities), so this
+    keeps one dict per distinct record instead of one per key. Records are
+    treated as read-only by every caller.
+    """
+    shared: Dict[tuple, Dict[str, str]] = {}
+    for key, record in mapping.items():
+        mapping[key] = shared.setdefault(tuple(sorted(record.items())), record)
+
+
+_share_records(_PHILIPPINE_ADMIN_MAPPING_RAW)
+_share_records(_PROVINCE_TO_REGION_RAW)
+
+
+def _fold_name(name: str) -> str:
+    """Lowercase and strip accents so "Parañaque" and "paranaque" compare equal"""
+    return unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii").lower()
+
+
+# Lowercased name -> canonical key, for case-insensitive lookups without a scan
+_CITY_KEYS: Dict[str, str] = {city.lower(): city for city in _PHILIPPINE_ADMIN_MAPPING_RAW}
+# Accent-folded name -> canonical key (first entry wins on collisions)
+_CITY_FOLDED_KEYS: Dict[str, str] = {}
+for _city in _PHILIPPINE_ADMIN_MAPPING_RAW:
+    _CITY_FOLDED_KEYS.setdefault(_fold_name(_city), _city)
+_PROVINCE_KEYS: Dict[str, str] = {province.lower(): province for province in _PROVINCE_TO_REGION_RAW}
+
+# Region code -> sorted city / province names
+_cities_by_region: Dict[str, List[str]] = {}
+for _city, _data in sorted(_PHILIPPINE_ADMIN_MAPPING_RAW.items()):
+    _cities_by_region.setdefault(_data['region'], []).append(_city)
+
+_provinces_by_region: Dict[str, List[str]] = {}
+for _province, _data in sorted(_PROVINCE_TO_REGION_RAW.items()):
+    _provinces_by_region.setdefault(_data['region'], []).append(_province)
+
+REGION_TO_CITIES: Dict[str, Tuple[str, ...]] = {
+    region: tuple(cities) for region, cities in _cities_by_region.items()
+}
+REGION_TO_PROVINCES: Dict[str, Tuple[str, ...]] = {
+    region: tuple(provinces) for region, provinces in _provinces_by_region.items()
+}
+
+# Province -> sorted city names
+_cities_by_province: Dict[str, List[str]] = {}
+for _city, _data in sorted(_PHILIPPINE_ADMIN_MAPPING_RAW.items()):
+    _cities_by_province.setdefault(_data['province'], []).append(_city)
+
+PROVINCE_TO_CITIES: Dict[str, Tuple[str, ...]] = {
+    province: tuple(cities) for province, cities in _cities_by_province.items()
+}
+
+# Lowercased region code -> canonical code
+_REGION_KEYS: Dict[str, str] = {
+    region.lower(): region for region in (*REGION_TO_CITIES, *REGION_TO_PROVINCES)
+}
+
+_ALL_REGIONS: Tuple[str, ...] = tuple(sorted(REGION_TO_PROVINCES))
+
+# Public read-only views: the indexes above are derived from the raw dicts, so
+# the mappings must not be modified after import
+PHILIPPINE_ADMIN_MAPPING: Mapping[str, Dict[str, str]] = MappingProxyType(_PHILIPPINE_ADMIN_MAPPING_RAW)
+PROVINCE_TO_REGION: Mapping[str, Dict[str, str]] = MappingProxyType(_PROVINCE_TO_REGION_RAW)
+
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
@@ -318,31 +412,89 @@ def get_region_from_location(
         >>> get_region_from_location(province="Cebu")
         {'region': 'Region VII', 'region_name': 'Central Visayas'}
     """
-    # Try direct city lookup first
+    # Try city lookup first (exact, then case/accent-insensitive)
     if city:
-        city_clean = city.strip()
-        if city_clean in PHILIPPINE_ADMIN_MAPPING:
-            return PHILIPPINE_ADMIN_MAPPING[city_clean]
-        
-        # Try case-insensitive match
-        for key, value in PHILIPPINE_ADMIN_MAPPING.items():
-            if key.lower() == city_clean.lower():
-                return value
+        key = resolve_city(city)
+        if key is not None:
+            return _PHILIPPINE_ADMIN_MAPPING_RAW[key]
     
     # Try province lookup
     if province:
-        province_clean = province.strip()
-        if province_clean in PROVINCE_TO_REGION:
-            return PROVINCE_TO_REGION[province_clean]
-        
-        # Try case-insensitive match
-        for key, value in PROVINCE_TO_REGION.items():
-            if key.lower() == province_clean.lower():
-                return value
+        return get_region_by_province(province)
     
     return None
 
 
+@lru_cache(maxsize=4096)
+def resolve_city(name: str) -> Optional[str]:
+    """
+    Resolve a city or municipality name to its key in PHILIPPINE_ADMIN_MAPPING.
+    
+    Matching ignores surrounding whitespace, case and accents. Results are
+    cached because Geo-NER output repeats the same names across a batch.
+    
+    Args:
+        name: City or municipality name as written in the source text
+        
+    Returns:
+        str: Canonical city name, or None if not in the mapping
+    
+    Example:
+        >>> resolve_city("paranaque")
+        'Parañaque'
+    """
+    name_clean = name.strip()
+    if name_clean in _PHILIPPINE_ADMIN_MAPPING_RAW:
+        return name_clean
+    
+    key = _CITY_KEYS.get(name_clean.lower())
+    if key is None:
+        key = _CITY_FOLDED_KEYS.get(_fold_name(name_clean))
+    return key
+
+
+def resolve_province(name: str) -> Optional[str]:
+    """
+    Resolve a province name to its key in PROVINCE_TO_REGION (case-insensitive).
+    
+    Args:
+        name: Province name as written in the source text
+        
+    Returns:
+        str: Canonical province name, or None if not in the mapping
+    
+    Example:
+        >>> resolve_province("ilocos norte")
+        'Ilocos Norte'
+    """
+    name_clean = name.strip()
+    if name_clean in _PROVINCE_TO_REGION_RAW:
+        return name_clean
+    return _PROVINCE_KEYS.get(name_clean.lower())
+
+
+@lru_cache(maxsize=1024)
+def get_region_by_province(province: str) -> Optional[Dict[str, str]]:
+    """
+    Get region information for a province name (case-insensitive).
+    
+    Results are cached like resolve_city; the returned dict is the shared
+    mapping record and must not be modified.
+    
+    Args:
+        province: Province name
+        
+    Returns:
+        dict: Dictionary with region and region_name, or None if not found
+    
+    Example:
+        >>> get_region_by_province("benguet")
+        {'region': 'CAR', 'region_name': 'Cordillera Administrative Region'}
+    """
+    key = resolve_province(province)
+    return _PROVINCE_TO_REGION_RAW[key] if key is not None else None
+
+
 def normalize_location_with_region(
     location_name: str,
     city: Optional[str] = None,
@@ -380,6 +532,10 @@ def normalize_location_with_region(
         'region_name': None
     }
     
+    # Nothing to look up (Geo-NER often returns only the raw name)
+    if not city and not province:
+        return result
+    
     # Try to get region from city or province
     region_data = get_region_from_location(city, province)
     
@@ -396,20 +552,17 @@ def normalize_location_with_region(
 
 def get_all_cities() -> List[str]:
     """Get list of all cities in the mapping."""
-    return list(PHILIPPINE_ADMIN_MAPPING.keys())
+    return list(_PHILIPPINE_ADMIN_MAPPING_RAW.keys())
 
 
 def get_all_provinces() -> List[str]:
     """Get list of all provinces in the mapping."""
-    return list(PROVINCE_TO_REGION.keys())
+    return list(_PROVINCE_TO_REGION_RAW.keys())
 
 
 def get_all_regions() -> List[str]:
     """Get list of all unique region codes."""
-    regions = set()
-    for data in PROVINCE_TO_REGION.values():
-        regions.add(data['region'])
-    return sorted(list(regions))
+    return list(_ALL_REGIONS)
 
 
 def get_cities_by_region(region: str) -> List[str]:
@@ -422,11 +575,7 @@ def get_cities_by_region(region: str) -> List[str]:
     Returns:
         list: City names in that region
     """
-    cities = []
-    for city, data in PHILIPPINE_ADMIN_MAPPING.items():
-        if data['region'].lower() == region.lower():
-            cities.append(city)
-    return sorted(cities)
+    return list(REGION_TO_CITIES.get(_REGION_KEYS.get(region.lower()), ()))
 
 
 def get_provinces_by_region(region: str) -> List[str]:
@@ -439,11 +588,21 @@ def get_provinces_by_region(region: str) -> List[str]:
     Returns:
         list: Province names in that region
     """
-    provinces = []
-    for province, data in PROVINCE_TO_REGION.items():
-        if data['region'].lower() == region.lower():
-            provinces.append(province)
-    return sorted(provinces)
+    return list(REGION_TO_PROVINCES.get(_REGION_KEYS.get(region.lower()), ()))
+
+
+def get_cities_by_province(province: str) -> List[str]:
+    """
+    Get all cities belonging to a specific province (case-insensitive).
+    
+    Args:
+        province: Province name (e.g., 'Benguet', 'Metro Manila')
+        
+    Returns:
+        list: City names in that province
+    """
+    key = resolve_province(province)
+    return list(PROVINCE_TO_CITIES.get(key, ())) if key is not None else []
 
 
 # ============================================================================
@@ -0,0 +1,198 @@
+"""
+RSS Feed Fetcher for GAIA
+Downloads RSS/Atom feeds asynchronously and hands the body to feedparser.
+
+Module: RSS-08 (Backend Integration)
+Security: Response size cap, request timeout
+
+feedparser.parse(url) downloads with blocking urllib inside a thread and has no
+size limit. Feeds are instead streamed with httpx on the event loop into a
+buffer capped at MAX_FEED_BYTES, and only the parse step runs in a thread.
+
+Parsing runs on a small dedicated thread pool rather than the loop's default
+executor, so however many downloads finish together at most
+MAX_CONCURRENT_PARSES feeds are being parsed (and held as parse trees) at once.
+
+Passing the etag/modified values of the previous download makes the request
+conditional: an unchanged feed answers 304 and nothing is downloaded or parsed.
+
+Redirects are followed, but every hop is checked first: a feed that redirects
+to a non-HTTP scheme or a private/loopback address is rejected (SSRF).
+"""
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import feedparser
+import httpx
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Feed download configuration
+FEED_TIMEOUT = 20.0  # seconds
+MAX_FEED_BYTES = 10 * 1024 * 1024  # 10MB
+FEED_USER_AGENT = "gaia_hazard_detection/1.0"
+
+# feedparser keeps the whole document tree in memory while parsing, so cap how
+# many feeds are parsed at the same time
+MAX_CONCURRENT_PARSES = 4
+_parse_executor = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_PARSES,
+    thread_name_prefix="gaia-feedparse"
+)
+
+# Host checks are cached briefly so re-fetching the same feeds doesn't repeat
+# DNS lookups, but short enough that a hostname re-pointed at an internal
+# address is caught within minutes
+HOST_CHECK_TTL = 300  # seconds
+_REDIRECT_SCHEMES = frozenset({"http", "https"})
+_host_checks: TTLCache = TTLCache(maxsize=256, ttl=HOST_CHECK_TTL)
+_host_checks_lock = threading.Lock()
+
+
+async def fetch_feed(
+    feed_url: str,
+    client: Optional[httpx.AsyncClient] = None,
+    etag: Optional[str] = None,
+    modified: Optional[str] = None,
+    sanitize_html: bool = True
+) -> feedparser.FeedParserDict:
+    """
+    Download and parse an RSS/Atom feed.
+
+    Args:
+        feed_url: URL of the feed
+        client: Shared HTTP client (a temporary one is created if omitted)
+        etag: ETag of the previous download (sent as If-None-Match)
+        modified: Last-Modified of the previous download (sent as If-Modified-Since)
+        sanitize_html: Run feedparser's HTML sanitizer and relative URI resolution.
+            Callers that reduce entry HTML to plain text can turn this off.
+
+    Returns:
+        FeedParserDict: Parsed feed (check .bozo for parse warnings). .status is
+            the HTTP status and .etag/.modified are set when the server sent them.
+            An unchanged feed has status 304 and no entries.
+
+    Raises:
+        httpx.HTTPError: On network errors or non-2xx responses
+        ValueError: If the feed exceeds MAX_FEED_BYTES or redirects to a
+            non-public address
+    """
+    if client is None:
+        async with create_feed_client() as temp_client:
+            return await fetch_feed(feed_url, temp_client, etag, modified, sanitize_html)
+
+    request_headers = {}
+    if etag:
+        request_headers["If-None-Match"] = etag
+    if modified:
+        request_headers["If-Modified-Since"] = modified
+
+    async with client.stream("GET", feed_url, headers=request_headers) as response:
+        if response.status_code == 304:
+            logger.debug(f"Feed not modified: {feed_url}")
+            return feedparser.FeedParserDict(
+                status=304,
+                entries=[],
+                bozo=False,
+                etag=etag,
+                modified=modified
+            )
+
+        response.raise_for_status()
+
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body.extend(chunk)
+            if len(body) > MAX_FEED_BYTES:
+                raise ValueError(f"Feed exceeds {MAX_FEED_BYTES // (1024 * 1024)}MB limit: {feed_url}")
+
+        headers = dict(response.headers)
+
+    # Parsing is CPU-bound - keep it off the event loop
+    loop = asyncio.get_event_loop()
+    feed = await loop.run_in_executor(
+        _parse_executor,
+        lambda: feedparser.parse(
+            bytes(body),
+            response_headers=headers,
+            sanitize_html=sanitize_html,
+            resolve_relative_uris=sanitize_html
+        )
+    )
+
+    # feedparser only fills these in when it downloads the feed itself
+    feed["status"] = response.status_code
+    if "etag" in response.headers:
+        feed["etag"] = response.headers["etag"]
+    if "last-modified" in response.headers:
+        feed["modified"] = response.headers["last-modified"]
+    return feed
+
+
+def is_public_host(hostname: str) -> bool:
+    """
+    Check that a hostname (or IP literal) only resolves to globally routable addresses.
+
+    Results are cached per hostname for HOST_CHECK_TTL seconds. Unresolvable
+    hosts are treated as not public. Resolving blocks, so call it off the
+    event loop.
+    """
+    with _host_checks_lock:
+        cached = _host_checks.get(hostname)
+    if cached is not None:
+        return cached
+
+    try:
+        addresses = [ipaddress.ip_address(hostname)]
+    except ValueError:
+        try:
+            infos = socket.getaddrinfo(hostname, None)
+        except (socket.gaierror, UnicodeError) as e:
+            logger.warning(f"Could not resolve feed host {hostname}: {str(e)}")
+            infos = []
+        # IPv6 link-local results may carry a %scope suffix
+        addresses = [ipaddress.ip_address(info[4][0].split('%')[0]) for info in infos]
+
+    result = bool(addresses) and all(address.is_global and not address.is_multicast for address in addresses)
+    with _host_checks_lock:
+        _host_checks[hostname] = result
+    return result
+
+
+async def _check_redirect(response: httpx.Response) -> None:
+    """
+    Response hook: refuse to follow a redirect to a non-public target.
+
+    httpx runs response hooks before deciding whether to follow a redirect, so
+    raising here stops the client from ever sending the next request.
+    """
+    if not response.has_redirect_location:
+        return
+
+    target = response.url.join(response.headers["location"])
+    hostname = target.host
+    if (
+        target.scheme not in _REDIRECT_SCHEMES
+        or not hostname
+        or hostname == "localhost"
+        or hostname.endswith(".localhost")
+        or not await asyncio.to_thread(is_public_host, hostname)
+    ):
+        raise ValueError(f"Blocked feed redirect from {response.url} to {target}")
+
+
+def create_feed_client() -> httpx.AsyncClient:
+    """Create an HTTP client configured for feed downloads"""
+    return httpx.AsyncClient(
+        timeout=FEED_TIMEOUT,
+        follow_redirects=True,
+        headers={"User-Agent": FEED_USER_AGENT},
+        event_hooks={"response": [_check_redirect]}
+    )
@@ -0,0 +1,22 @@
+"""
+Hazard Keywords for GAIA
+Cheap regex pre-screen shared by the RSS processors.
+
+Module: RSS-08 (Backend Integration)
+
+A regex scan is far cheaper than a classifier forward pass or parsing an
+entry's full content HTML, so both processors check entry text against
+HAZARD_KEYWORD_RE before doing either. Keep the stems broad: a missed keyword
+means a hazard is never classified.
+"""
+
+import re
+
+# Hazard word stems (English, Filipino and the agencies that issue warnings)
+HAZARD_KEYWORD_RE = re.compile(
+    r'\b(flood|fire|wildfire|blaze|quake|earthquake|tremor|landslide|mudslide|typhoon|'
+    r'storm|cyclone|depression|erupt|volcan|lahar|tsunami|drought|tornado|rain|'
+    r'inundat|evacuat|disaster|calamit|baha|lindol|bagyo|sunog|guho|pagsabog|'
+    r'pagasa|phivolcs|ndrrmc)',
+    re.IGNORECASE
+)
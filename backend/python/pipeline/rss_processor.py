@@ -6,23 +6,35 @@ Integrates with Classifier and Geo-NER for hazard detection pipeline.
 
 import feedparser
 import time
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from dateutil import parser as date_parser
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 import logging
 import asyncio
-from typing import Dict, List, Optional
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Awaitable, Dict, List, Optional
 import os
 
 # Import AI models
 from backend.python.models.classifier import classifier
 from backend.python.models.geo_ner import geo_ner
 
+from backend.python.pipeline.feed_fetcher import create_feed_client, fetch_feed
+from backend.python.pipeline.hazard_keywords import HAZARD_KEYWORD_RE
+
 # Note: Supabase integration will be added when connecting to database
 # For now, this module processes RSS feeds and returns structured data
 
 logger = logging.getLogger(__name__)
 
+# Runs of whitespace collapsed by _clean_html
+_WHITESPACE_RE = re.compile(r'\s+')
+# CDATA sections, whose content lxml's HTML parser would drop
+_CDATA_RE = re.compile(r'<!\[CDATA\[(.*?)\]\]>', re.DOTALL)
+
 
 class RSSProcessor:
     """
@@ -37,6 +49,12 @@ class RSSProcessor:
         'https://www.rappler.com/nation/rss',
     ]
     
+    # Maximum feed downloads in flight at once
+    MAX_CONCURRENT_FETCHES = 8
+    
+    # Threads reserved for classifier/Geo-NER inference
+    ML_INFERENCE_WORKERS = 2
+    
     def __init__(self, classification_threshold: float = 0.5):
         """
         Initialize RSS Processor.
@@ -46,6 +64,12 @@ class RSSProcessor:
         """
         self.feeds = []
         self.classification_threshold = classification_threshold
+        # Inference gets its own pool so it never queues behind (or starves) the
+        # feed parsing done in the default executor; threads start lazily
+        self._ml_executor = ThreadPoolExecutor(
+            max_workers=self.ML_INFERENCE_WORKERS,
+            thread_name_prefix='gaia-ml'
+        )
         
     def set_feeds(self, feed_urls: List[str]):
         """Set the RSS feed URLs to process"""
@@ -65,18 +89,105 @@ class RSSProcessor:
         
         results = []
         
-        for feed_url in self.feeds:
-            result = await self.process_feed(feed_url)
-            results.append(result)
+        async with create_feed_client() as client:
+            downloads = self._start_downloads(client)
+            
+            for feed_url, download in zip(self.feeds, downloads):
+                result = await self.process_feed(feed_url, download)
+                results.append(result)
         
         return results
     
-    async def process_feed(self, feed_url: str) -> Dict:
+    async def iter_hazards(self, stats: Optional[Dict] = None) -> AsyncIterator[Dict]:
+        """
+        Process all configured RSS feeds, yielding each hazard as soon as it is found.
+        
+        Unlike process_all_feeds(), hazards are not collected per feed, so memory
+        stays bounded by a single entry no matter how many feeds are processed.
+        
+        Args:
+            stats: Optional dict updated in place with feeds_processed, errors,
+                items_processed and hazards_found counters
+            
+        Yields:
+            dict: Hazard data (same structure as process_feed's hazards_found items)
+        """
+        if not self.feeds:
+            self.feeds = self.DEFAULT_FEEDS
+            logger.info(f"Using default feeds: {len(self.feeds)} sources")
+        
+        if stats is None:
+            stats = {}
+        for key in ('feeds_processed', 'errors', 'items_processed', 'hazards_found'):
+            stats.setdefault(key, 0)
+        
+        async with create_feed_client() as client:
+            downloads = self._start_downloads(client)
+            
+            for feed_url, download in zip(self.feeds, downloads):
+                stats['feeds_processed'] += 1
+                logger.info(f"Processing RSS feed: {feed_url}")
+                
+                try:
+                    feed = await download
+                    if feed.bozo:
+                        logger.warning(f"Feed parsing warning for {feed_url}: {feed.bozo_exception}")
+                    
+                    async for hazard_data in self._iter_feed_hazards(feed_url, feed, stats):
+                        stats['hazards_found'] += 1
+                        yield hazard_data
+                        
+                except Exception as e:
+                    stats['errors'] += 1
+                    logger.error(f"Error processing feed {feed_url}: {str(e)}")
+    
+    def _start_downloads(self, client) -> List[asyncio.Future]:
+        """
+        Start downloading every configured feed (at most MAX_CONCURRENT_FETCHES at once).
+        
+        Entries are still processed one feed at a time (in order) so classifier/Geo-NER
+        inference is never run concurrently.
+        
+        Args:
+            client: Shared HTTP client from create_feed_client()
+            
+        Returns:
+            list: One pending download per feed, in self.feeds order
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_FETCHES)
+        
+        async def fetch_limited(feed_url: str) -> feedparser.FeedParserDict:
+            async with semaphore:
+                return await self._fetch(feed_url, client)
+        
+        return [asyncio.ensure_future(fetch_limited(url)) for url in self.feeds]
+    
+    async def _fetch(self, feed_url: str, client=None) -> feedparser.FeedParserDict:
+        """
+        Download and parse a feed for classification.
+        
+        Args:
+            feed_url: URL of the RSS feed
+            client: Shared HTTP client (a temporary one is created if omitted)
+            
+        Returns:
+            FeedParserDict: Parsed feed
+        """
+        # _clean_html reduces entry HTML to text, so feedparser's sanitizer would
+        # only duplicate that parse
+        return await fetch_feed(feed_url, client, sanitize_html=False)
+    
+    async def process_feed(
+        self,
+        feed_url: str,
+        download: Optional[Awaitable[feedparser.FeedParserDict]] = None
+    ) -> Dict:
         """
         Process a single RSS feed.
         
         Args:
             feed_url: URL of the RSS feed
+            download: Pending download started by process_all_feeds (fetched here if omitted)
             
         Returns:
             dict: Processing results
@@ -91,71 +202,24 @@ class RSSProcessor:
                 }
         """
         start_time = time.time()
-        items_processed = 0
+        counts = {'items_processed': 0}
         items_added = 0
         hazards_found = []
         
         logger.info(f"Processing RSS feed: {feed_url}")
         
         try:
-            # Parse RSS feed (run in thread pool to avoid blocking)
-            loop = asyncio.get_event_loop()
-            feed = await loop.run_in_executor(None, feedparser.parse, feed_url)
+            # Download feed asynchronously and parse it in the thread pool
+            feed = await (download if download is not None else self._fetch(feed_url))
             
             if feed.bozo:
                 logger.warning(f"Feed parsing warning for {feed_url}: {feed.bozo_exception}")
             
-            # Process each entry
-            for entry in feed.entries:
-                items_processed += 1
-                
-                try:
-                    # Extract content
-                    content_data = self._extract_content(entry)
-                    
-                    # Skip if no content
-                    if not content_data['text'].strip():
-                        logger.debug(f"Skipping entry with no content: {entry.get('title', 'Unknown')}")
-                        continue
-                    
-                    # Classify content (run in thread pool to avoid blocking event loop)
-                    classification = await loop.run_in_executor(
-                        None,
-                        classifier.classify,
-                        content_data['text'],
-                        self.classification_threshold
-                    )
-                    
-                    # Only process if classified as hazard
-                    if classification['is_hazard']:
-                        # Extract locations (run in thread pool to avoid blocking event loop)
-                        locations = await loop.run_in_executor(
-                            None,
-                            geo_ner.extract_locations,
-                            content_data['text']
-                        )
-                        
-                        # Only save if locations were found
-                        if locations:
-                            hazard_data = self._create_hazard_data(
-                                entry,
-                                content_data,
-                                classification,
-                                locations,
-                                feed_url
-                            )
-                            
-                            hazards_found.append(hazard_data)
-                            items_added += 1
-                            logger.info(f"Found hazard: {hazard_data['title']}")
-                        else:
-                            logger.debug(f"No locations found for: {entry.get('title', 'Unknown')}")
-                    else:
-                        logger.debug(f"Not classified as hazard: {entry.get('title', 'Unknown')}")
-                        
-                except Exception as e:
-                    logger.error(f"Error processing entry {entry.get('link', 'unknown')}: {str(e)}")
-                    continue
+            async for hazard_data in self._iter_feed_hazards(feed_url, feed, counts):
+                hazards_found.append(hazard_data)
+                items_added += 1
+            
+            items_processed = counts['items_processed']
             
             # Calculate processing time
             processing_time = time.time() - start_time
@@ -181,12 +245,114 @@ class RSSProcessor:
                 'feed_url': feed_url,
                 'status': 'error',
                 'error_message': error_msg,
-                'items_processed': items_processed,
+                'items_processed': counts['items_processed'],
                 'items_added': items_added,
                 'hazards_found': hazards_found,
                 'processing_time': processing_time
             }
     
+    async def _iter_feed_hazards(
+        self,
+        feed_url: str,
+        feed: feedparser.FeedParserDict,
+        counts: Dict
+    ) -> AsyncIterator[Dict]:
+        """
+        Classify a parsed feed's entries and yield the hazards found.
+        
+        Args:
+            feed_url: URL of the RSS feed
+            feed: Parsed feed
+            counts: Dict whose 'items_processed' counter is incremented per entry
+            
+        Yields:
+            dict: Hazard data from _create_hazard_data()
+        """
+        loop = asyncio.get_event_loop()
+        # One timestamp for the whole feed instead of one clock read per entry
+        processed_at = datetime.now(timezone.utc).isoformat()
+        
+        # Process each entry
+        for entry in feed.entries:
+            counts['items_processed'] += 1
+            
+            try:
+                hazard_data = await self._process_entry(loop, entry, feed_url, processed_at)
+            except Exception as e:
+                logger.error(f"Error processing entry {entry.get('link', 'unknown')}: {str(e)}")
+                continue
+            
+            if hazard_data is None:
+                continue
+            
+            logger.info(f"Found hazard: {hazard_data['title']}")
+            yield hazard_data
+    
+    async def _process_entry(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        entry: feedparser.FeedParserDict,
+        feed_url: str,
+        processed_at: str
+    ) -> Optional[Dict]:
+        """
+        Run a single entry through the classifier and Geo-NER.
+        
+        Args:
+            loop: Running event loop (for the thread pool)
+            entry: RSS entry
+            feed_url: Source feed URL
+            processed_at: ISO timestamp of the feed run
+            
+        Returns:
+            dict: Hazard data, or None if the entry is not a located hazard
+        """
+        # Extract content
+        content_data = self._extract_content(entry)
+        
+        # Skip if no content
+        if not content_data['text'].strip():
+            logger.debug(f"Skipping entry with no content: {entry.get('title', 'Unknown')}")
+            return None
+        
+        # Classify content (run in the inference pool to avoid blocking event loop)
+        classification = await loop.run_in_executor(
+            self._ml_executor,
+            classifier.classify,
+            content_data['text'],
+            self.classification_threshold
+        )
+        
+        # Only process if classified as hazard
+        if not classification['is_hazard']:
+            logger.debug(f"Not classified as hazard: {entry.get('title', 'Unknown')}")
+            return None
+        
+        # Content HTML was skipped by the keyword prefilter - clean it now
+        if not content_data['hazard_hint']:
+            content_data['content'] = self._clean_html(self._raw_content(entry))
+        
+        # Extract locations (run in the inference pool to avoid blocking event loop)
+        locations = await loop.run_in_executor(
+            self._ml_executor,
+            geo_ner.extract_locations,
+            content_data['text']
+        )
+        
+        # Only save if locations were found
+        if not locations:
+            logger.debug(f"No locations found for: {entry.get('title', 'Unknown')}")
+            return None
+        
+        return self._create_hazard_data(
+            entry,
+            content_data,
+            classification,
+            locations,
+            feed_url,
+            processed_at
+        )
+    
     def _extract_content(self, entry: feedparser.FeedParserDict) -> Dict:
         """
         Extract and clean content from RSS entry.
@@ -199,8 +365,9 @@ class RSSProcessor:
                 {
                     'title': str,
                     'description': str,
-                    'content': str,
-                    'text': str (combined for analysis)
+                    'content': str ('' when skipped by the prefilter),
+                    'text': str (combined for analysis),
+                    'hazard_hint': bool (title/summary mention a hazard)
                 }
         """
         # Get title
@@ -208,15 +375,14 @@ class RSSProcessor:
         
         # Get description/summary
         description = entry.get('summary', '') or entry.get('description', '')
-        
-        # Get full content if available
-        content = ''
-        if hasattr(entry, 'content'):
-            content = entry.content[0].value if entry.content else ''
-        
-        # Clean HTML from content
         description_clean = self._clean_html(description)
-        content_clean = self._clean_html(content)
+        
+        # Full content is the largest HTML field - only parse it when the title
+        # or summary hint at a hazard (or there is no summary to classify)
+        hazard_hint = bool(HAZARD_KEYWORD_RE.search(title) or HAZARD_KEYWORD_RE.search(description_clean))
+        content_clean = ''
+        if hazard_hint or not description_clean:
+            content_clean = self._clean_html(self._raw_content(entry))
         
         # Combine for analysis (title has most important keywords)
         full_text = f"{title}. {description_clean} {content_clean}".strip()
@@ -225,9 +391,15 @@ class RSSProcessor:
             'title': title,
             'description': description_clean,
             'content': content_clean,
-            'text': full_text
+            'text': full_text,
+            'hazard_hint': hazard_hint
         }
     
+    def _raw_content(self, entry: feedparser.FeedParserDict) -> str:
+        """Get the entry's full content HTML, if the feed provides it"""
+        content_list = entry.get('content')
+        return content_list[0].get('value', '') if content_list else ''
+    
     def _clean_html(self, html_text: str) -> str:
         """
         Remove HTML tags and clean text.
@@ -241,13 +413,45 @@ class RSSProcessor:
         if not html_text:
             return ''
         
-        soup = BeautifulSoup(html_text, 'html.parser')
-        text = soup.get_text(separator=' ', strip=True)
+        # lxml treats CDATA as a comment and drops its text - unwrap it first
+        if '<![CDATA[' in html_text:
+            html_text = _CDATA_RE.sub(r'\1', html_text)
         
-        # Remove extra whitespace
-        text = ' '.join(text.split())
+        # lxml's C parser is much faster than BeautifulSoup's pure-Python
+        # html.parser; joining text nodes with ' ' matches get_text(separator=' ')
+        try:
+            root = lxml.html.fragment_fromstring(html_text, create_parent='div')
+            # Feeds are parsed unsanitized - drop code that isn't article text
+            etree.strip_elements(root, 'script', 'style', with_tail=False)
+            text = ' '.join(root.itertext())
+        except (etree.ParserError, ValueError):
+            text = html_text
         
-        return text
+        # Remove extra whitespace (one regex pass, no token list)
+        return _WHITESPACE_RE.sub(' ', text).strip()
+    
+    def _parse_date(self, date_text: str) -> Optional[datetime]:
+        """
+        Parse an entry date that feedparser could not parse itself.
+        
+        RSS dates are RFC 2822, so the single-format email.utils parser is tried
+        before dateutil, which tries many formats.
+        
+        Args:
+            date_text: Raw date string from the entry
+            
+        Returns:
+            datetime: Parsed date, or None if unparseable
+        """
+        try:
+            return parsedate_to_datetime(date_text)
+        except (TypeError, ValueError, IndexError):
+            pass
+        
+        try:
+            return date_parser.parse(date_text)
+        except (ValueError, OverflowError):
+            return None
     
     def _create_hazard_data(
         self,
@@ -255,7 +459,8 @@ class RSSProcessor:
         content_data: Dict,
         classification: Dict,
         locations: List[Dict],
-        feed_url: str
+        feed_url: str,
+        processed_at: Optional[str] = None
     ) -> Dict:
         """
         Create hazard data structure from processed entry.
@@ -266,6 +471,7 @@ class RSSProcessor:
             classification: Classification result
             locations: Extracted locations
             feed_url: Source feed URL
+            processed_at: ISO timestamp of the feed run (defaults to now, UTC)
             
         Returns:
             dict: Hazard data ready for database insertion
@@ -275,10 +481,7 @@ class RSSProcessor:
         if hasattr(entry, 'published_parsed') and entry.published_parsed:
             published_date = datetime(*entry.published_parsed[:6])
         elif hasattr(entry, 'published'):
-            try:
-                published_date = date_parser.parse(entry.published)
-            except:
-                pass
+            published_date = self._parse_date(entry.published)
         
         # Build hazard data structure
         hazard_data = {
@@ -291,7 +494,7 @@ class RSSProcessor:
             'source': feed_url,
             'published_date': published_date.isoformat() if published_date else None,
             'locations': locations,
-            'processed_at': datetime.utcnow().isoformat()
+            'processed_at': processed_at or datetime.now(timezone.utc).isoformat()
         }
         
         return hazard_data
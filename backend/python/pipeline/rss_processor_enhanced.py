@@ -11,12 +11,16 @@ Security: Input sanitization, duplicate detection, content hashing, URL validati
 import feedparser
 import time
 import hashlib
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from dateutil import parser as date_parser
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 import logging
 import asyncio
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Dict, List, Optional, Tuple
+import math
 import os
 import re
 from urllib.parse import urlparse
@@ -28,8 +32,52 @@ from backend.python.models.geo_ner import geo_ner
 # Import Supabase client
 from backend.python.lib.supabase_client import supabase
 
+from backend.python.pipeline.feed_fetcher import create_feed_client, fetch_feed, is_public_host
+from backend.python.pipeline.hazard_keywords import HAZARD_KEYWORD_RE
+
 logger = logging.getLogger(__name__)
 
+# Radius used by the proximity duplicate check (find_nearby_hazard RPC)
+DUPLICATE_RADIUS_KM = 5.0
+
+# URLs/content hashes per IN (...) query when prefetching duplicates
+DUPLICATE_PREFETCH_CHUNK = 50
+
+# Classified feeds that may wait for the database stage of process_all_feeds
+FEED_PIPELINE_DEPTH = 2
+
+# Seconds before confidence thresholds are re-read from system_config
+CONFIDENCE_THRESHOLD_TTL = 300
+
+# Seconds before the classifier's active model version is read again
+ACTIVE_MODEL_TTL = 60
+
+# Defaults when system_config has no (or an unreadable) value
+DEFAULT_CONFIDENCE_THRESHOLD_RSS = 0.70
+DEFAULT_CONFIDENCE_THRESHOLD_CITIZEN = 0.50
+
+# Classifier labels mapped to gaia.hazards hazard_type enum values
+HAZARD_TYPE_MAP = {
+    'flooding': 'flood',
+    'fire': 'fire',
+    'earthquake': 'earthquake',
+    'typhoon': 'typhoon',
+    'landslide': 'landslide',
+    'volcanic eruption': 'volcanic_eruption',
+    'drought': 'drought',
+    'tsunami': 'tsunami',
+    'storm surge': 'storm_surge',
+    'tornado': 'tornado'
+}
+
+# Feed URL schemes accepted by _validate_url
+_ALLOWED_URL_SCHEMES = frozenset({'http', 'https'})
+
+# Runs of whitespace collapsed by _clean_html
+_WHITESPACE_RE = re.compile(r'\s+')
+# CDATA sections, whose content lxml's HTML parser would drop
+_CDATA_RE = re.compile(r'<!\[CDATA\[(.*?)\]\]>', re.DOTALL)
+
 
 class RSSProcessorEnhanced:
     """
@@ -49,10 +97,6 @@ class RSSProcessorEnhanced:
     """
     
     # Default Philippine news RSS feeds
-    
-    # Cache for system config thresholds (refreshed per processing session)
-    _confidence_threshold_rss = None
-    _confidence_threshold_citizen = None
     DEFAULT_FEEDS = [
         'https://www.gmanetwork.com/news/rss/news/',
         'https://www.gmanetwork.com/news/rss/publicaffairs/',
@@ -60,17 +104,39 @@ class RSSProcessorEnhanced:
         'https://www.rappler.com/nation/rss',
     ]
     
-    def __init__(self, classification_threshold: float = 0.5, duplicate_time_window_hours: int = 48):
+    # Maximum feed downloads in flight at once
+    MAX_CONCURRENT_FETCHES = 8
+    
+    def __init__(
+        self,
+        classification_threshold: float = 0.5,
+        duplicate_time_window_hours: int = 48,
+        keyword_prefilter: bool = True
+    ):
         """
         Initialize Enhanced RSS Processor.
         
         Args:
             classification_threshold: Minimum confidence for hazard classification (default: 0.5)
             duplicate_time_window_hours: Time window for duplicate detection (default: 48 hours)
+            keyword_prefilter: Only classify entries that mention a hazard trigger word (default: True)
         """
         self.feeds = []
         self.classification_threshold = classification_threshold
         self.duplicate_time_window = duplicate_time_window_hours
+        self.keyword_prefilter = keyword_prefilter
+        
+        # Single thread for classifier/Geo-NER inference: keeps the event loop
+        # free for database work and never runs the models concurrently
+        self._ml_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='gaia-ml')
+        
+        # Cached (rss_threshold, citizen_threshold) and when they were loaded
+        self._confidence_thresholds: Optional[Tuple[float, float]] = None
+        self._confidence_thresholds_loaded_at = 0.0
+        
+        # Cached classifier.get_active_model() result and when it was read
+        self._active_model: Optional[str] = None
+        self._active_model_loaded_at = 0.0
         
         # Statistics tracking
         self.stats = {
@@ -88,6 +154,9 @@ class RSSProcessorEnhanced:
         Set the RSS feed URLs to process.
         Validates URLs before storing.
         
+        Validation resolves every feed host (blocking DNS lookups), so async
+        callers should run this in a worker thread (asyncio.to_thread).
+        
         Args:
             feed_urls: List of RSS feed URLs
         """
@@ -98,47 +167,86 @@ class RSSProcessorEnhanced:
     def _get_confidence_thresholds(self) -> Tuple[float, float]:
         """
         Fetch confidence thresholds from system_config table.
-        Uses cached values if available for performance.
+        Values are cached for CONFIDENCE_THRESHOLD_TTL seconds, so admin changes
+        are picked up without a database trip per hazard.
         
         Returns:
             tuple: (rss_threshold, citizen_threshold)
         """
+        now = time.monotonic()
+        if (self._confidence_thresholds is not None
+                and now - self._confidence_thresholds_loaded_at < CONFIDENCE_THRESHOLD_TTL):
+            return self._confidence_thresholds
+        
+        rss_threshold = None
+        citizen_threshold = None
         try:
-            # Return cached values if available
-            if self._confidence_threshold_rss is not None and self._confidence_threshold_citizen is not None:
-                return self._confidence_threshold_rss, self._confidence_threshold_citizen
-            
             # Fetch from database
             response = supabase.schema('gaia').from_('system_config').select('config_key, config_value').in_('config_key', ['confidence_threshold_rss', 'confidence_threshold_citizen']).execute()
             
             if response.data:
                 for config in response.data:
                     if config['config_key'] == 'confidence_threshold_rss':
-                        self._confidence_threshold_rss = float(config['config_value'])
+                        rss_threshold = float(config['config_value'])
                     elif config['config_key'] == 'confidence_threshold_citizen':
-                        self._confidence_threshold_citizen = float(config['config_value'])
+                        citizen_threshold = float(config['config_value'])
                 
-                logger.info(f"Fetched confidence thresholds: RSS={self._confidence_threshold_rss}, Citizen={self._confidence_threshold_citizen}")
-            
-            # Use defaults if not found
-            if self._confidence_threshold_rss is None:
-                self._confidence_threshold_rss = 0.70
-                logger.warning(f"Using default RSS threshold: {self._confidence_threshold_rss}")
-            if self._confidence_threshold_citizen is None:
-                self._confidence_threshold_citizen = 0.50
-                logger.warning(f"Using default citizen threshold: {self._confidence_threshold_citizen}")
-            
-            return self._confidence_threshold_rss, self._confidence_threshold_citizen
+                logger.info(f"Fetched confidence thresholds: RSS={rss_threshold}, Citizen={citizen_threshold}")
             
         except Exception as e:
+            # Fallback to defaults (cached too, so a failing database isn't queried per hazard)
             logger.error(f"Error fetching confidence thresholds: {str(e)}")
-            # Fallback to defaults
-            return 0.70, 0.50
+        
+        # Use defaults if not found
+        if rss_threshold is None:
+            rss_threshold = DEFAULT_CONFIDENCE_THRESHOLD_RSS
+            logger.warning(f"Using default RSS threshold: {rss_threshold}")
+        if citizen_threshold is None:
+            citizen_threshold = DEFAULT_CONFIDENCE_THRESHOLD_CITIZEN
+            logger.warning(f"Using default citizen threshold: {citizen_threshold}")
+        
+        self._confidence_thresholds = (rss_threshold, citizen_threshold)
+        self._confidence_thresholds_loaded_at = now
+        return self._confidence_thresholds
+    
+    async def _load_confidence_thresholds(self) -> Tuple[float, float]:
+        """
+        Async wrapper for _get_confidence_thresholds().
+        
+        Returns the cached thresholds directly and only runs the (blocking)
+        system_config query in a worker thread when the cache has expired.
+        
+        Returns:
+            tuple: (rss_threshold, citizen_threshold)
+        """
+        if (self._confidence_thresholds is not None
+                and time.monotonic() - self._confidence_thresholds_loaded_at < CONFIDENCE_THRESHOLD_TTL):
+            return self._confidence_thresholds
+        return await asyncio.to_thread(self._get_confidence_thresholds)
+    
+    def _get_active_model(self) -> str:
+        """
+        Get the classifier's active model version for hazard rows.
+        Cached for ACTIVE_MODEL_TTL seconds instead of asked for every row.
+        
+        Returns:
+            str: Model version recorded in hazards.model_version
+        """
+        now = time.monotonic()
+        if self._active_model is None or now - self._active_model_loaded_at >= ACTIVE_MODEL_TTL:
+            self._active_model = classifier.get_active_model()
+            self._active_model_loaded_at = now
+        return self._active_model
     
     async def process_all_feeds(self) -> List[Dict]:
         """
         Process all configured RSS feeds asynchronously.
         
+        Feeds go through a two-stage pipeline connected by an asyncio.Queue:
+        one task classifies entries (in the ML thread) while another runs the
+        duplicate checks and bulk insert of the previous feed (in worker
+        threads), so model inference and database round trips overlap.
+        
         Returns:
             list: Processing results for each feed with statistics
         """
@@ -154,11 +262,46 @@ class RSSProcessorEnhanced:
             'errors': 0
         }
         
+        # Load thresholds once up front (cached for the rest of the session)
+        await self._load_confidence_thresholds()
+        
         results = []
+        # Classified feeds waiting to be stored (bounded so classification
+        # can't run far ahead of the database)
+        classified: asyncio.Queue = asyncio.Queue(maxsize=FEED_PIPELINE_DEPTH)
         
-        for feed_url in self.feeds:
-            result = await self.process_feed(feed_url)
-            results.append(result)
+        # ETag/Last-Modified of the previous run, so unchanged feeds answer 304
+        feed_state = await asyncio.to_thread(self._load_feed_state, self.feeds)
+        
+        async with create_feed_client() as client:
+            downloads = self._start_downloads(client, feed_state)
+            
+            async def classify_stage() -> None:
+                try:
+                    for feed_url, download in zip(self.feeds, downloads):
+                        batch = await self._classify_feed(feed_url, download, feed_state.get(feed_url, {}))
+                        await classified.put(batch)
+                finally:
+                    await classified.put(None)
+            
+            # Feeds are stored one at a time, in order, so duplicate checks see
+            # the hazards inserted for earlier feeds
+            async def store_stage() -> None:
+                while True:
+                    batch = await classified.get()
+                    if batch is None:
+                        return
+                    results.append(await self._store_feed(batch))
+            
+            stages = [asyncio.ensure_future(classify_stage()), asyncio.ensure_future(store_stage())]
+            try:
+                await asyncio.gather(*stages)
+            except BaseException:
+                for stage in stages:
+                    stage.cancel()
+                for download in downloads:
+                    download.cancel()
+                raise
         
         logger.info(f"RSS Processing Complete - Processed: {self.stats['total_processed']}, "
                    f"Stored: {self.stats['total_stored']}, "
@@ -167,12 +310,43 @@ class RSSProcessorEnhanced:
         
         return results
     
-    async def process_feed(self, feed_url: str) -> Dict:
+    def _start_downloads(self, client, feed_state: Dict[str, Dict]) -> List[asyncio.Future]:
+        """
+        Start downloading every configured feed (at most MAX_CONCURRENT_FETCHES at once).
+        
+        Args:
+            client: Shared HTTP client from create_feed_client()
+            feed_state: Result of _load_feed_state() (downloads are conditional
+                for feeds with stored validators)
+            
+        Returns:
+            list: One pending download per feed, in self.feeds order
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_FETCHES)
+        
+        async def fetch_limited(feed_url: str) -> feedparser.FeedParserDict:
+            state = feed_state.get(feed_url, {})
+            async with semaphore:
+                return await fetch_feed(
+                    feed_url,
+                    client,
+                    etag=state.get('etag'),
+                    modified=state.get('last_modified')
+                )
+        
+        return [asyncio.ensure_future(fetch_limited(url)) for url in self.feeds]
+    
+    async def process_feed(
+        self,
+        feed_url: str,
+        download: Optional[Awaitable[feedparser.FeedParserDict]] = None
+    ) -> Dict:
         """
         Process a single RSS feed with database integration.
         
         Args:
             feed_url: URL of the RSS feed
+            download: Pending download started by process_all_feeds (fetched here if omitted)
             
         Returns:
             dict: Processing results
@@ -187,98 +361,353 @@ class RSSProcessorEnhanced:
                     'error_message': str (optional)
                 }
         """
-        start_time = time.time()
-        items_processed = 0
-        items_added = 0
-        duplicates_detected = 0
-        hazards_saved = []
+        return await self._store_feed(await self._classify_feed(feed_url, download))
+    
+    def _load_feed_state(self, feed_urls: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch the state stored for feeds in gaia.rss_feed_state.
+        
+        Args:
+            feed_urls: Feed URLs about to be downloaded
+            
+        Returns:
+            dict: feed_url -> {'etag', 'last_modified', 'last_published_at'}
+                (feeds without a stored state, or all feeds if the lookup
+                failed, are missing). last_published_at is a datetime.
+        """
+        try:
+            response = supabase.schema('gaia').from_('rss_feed_state') \
+                .select('feed_url, etag, last_modified, last_published_at') \
+                .in_('feed_url', feed_urls) \
+                .execute()
+            feed_state = {}
+            for row in response.data or []:
+                if row.get('last_published_at'):
+                    row['last_published_at'] = _as_utc(date_parser.parse(row['last_published_at']))
+                feed_state[row['feed_url']] = row
+            return feed_state
+        except Exception as e:
+            # Without validators every feed is simply downloaded in full
+            logger.error(f"Error loading feed state: {str(e)}")
+            return {}
+    
+    def _save_feed_state(
+        self,
+        feed_url: str,
+        etag: Optional[str],
+        modified: Optional[str],
+        last_published_at: Optional[datetime]
+    ) -> None:
+        """
+        Store the state of a processed feed in gaia.rss_feed_state.
+        
+        Args:
+            feed_url: URL of the RSS feed
+            etag: ETag response header of the download
+            modified: Last-Modified response header of the download
+            last_published_at: Newest published date of the entries handled so far
+        """
+        try:
+            supabase.schema('gaia').from_('rss_feed_state').upsert({
+                'feed_url': feed_url,
+                'etag': etag,
+                'last_modified': modified,
+                'last_published_at': last_published_at.isoformat() if last_published_at else None,
+                'last_checked': datetime.now(timezone.utc).isoformat()
+            }).execute()
+        except Exception as e:
+            logger.error(f"Error saving feed state for {feed_url}: {str(e)}")
+    
+    async def _classify_feed(
+        self,
+        feed_url: str,
+        download: Optional[Awaitable[feedparser.FeedParserDict]] = None,
+        state: Optional[Dict] = None
+    ) -> Dict:
+        """
+        First pipeline stage: download a feed and classify its new entries.
+        
+        Args:
+            feed_url: URL of the RSS feed
+            download: Pending download started by process_all_feeds (fetched here if omitted)
+            state: Stored state of the feed from _load_feed_state() (loaded here if omitted)
+            
+        Returns:
+            dict: Batch for _store_feed() with the feed URL, start time, entry
+                count, located hazard candidates, the previous and new feed
+                state (None if the feed was unchanged) and error message (if any)
+        """
+        batch = {
+            'feed_url': feed_url,
+            'start_time': time.time(),
+            'items_processed': 0,
+            'candidates': [],
+            'previous_state': state,
+            'state': None,
+            'error_message': None
+        }
         
         logger.info(f"Processing RSS feed: {feed_url}")
         
         try:
-            # Parse RSS feed (run in thread pool to avoid blocking)
-            loop = asyncio.get_event_loop()
-            feed = await loop.run_in_executor(None, feedparser.parse, feed_url)
+            if state is None:
+                state = (await asyncio.to_thread(self._load_feed_state, [feed_url])).get(feed_url, {})
+                batch['previous_state'] = state
+            if download is None:
+                download = fetch_feed(feed_url, etag=state.get('etag'), modified=state.get('last_modified'))
+            
+            # Download feed asynchronously and parse it in the thread pool
+            feed = await download
+            
+            if feed.get('status') == 304:
+                logger.info(f"Feed unchanged since last run: {feed_url}")
+                return batch
             
             if feed.bozo:
                 logger.warning(f"Feed parsing warning for {feed_url}: {feed.bozo_exception}")
             
-            # Process each entry
-            for entry in feed.entries:
-                items_processed += 1
-                self.stats['total_processed'] += 1
+            # Model inference is synchronous - keep it off the event loop
+            loop = asyncio.get_event_loop()
+            published_since = state.get('last_published_at')
+            candidates, processed, errors, latest_published = await loop.run_in_executor(
+                self._ml_executor,
+                self._classify_entries,
+                feed.entries,
+                published_since
+            )
+            
+            batch['items_processed'] = processed
+            batch['candidates'] = candidates
+            batch['state'] = {
+                'etag': feed.get('etag'),
+                'modified': feed.get('modified'),
+                # An entry that failed would be skipped from now on - keep the
+                # old boundary so the next run retries it
+                'last_published_at': published_since if errors else latest_published
+            }
+            self.stats['total_processed'] += processed
+            self.stats['errors'] += errors
+            
+        except Exception as e:
+            batch['error_message'] = str(e)
+        
+        return batch
+    
+    def _classify_entries(
+        self,
+        entries: List[feedparser.FeedParserDict],
+        published_since: Optional[datetime] = None
+    ) -> Tuple[List[Tuple[feedparser.FeedParserDict, Dict, Dict, List[Dict]]], int, int, Optional[datetime]]:
+        """
+        Classify feed entries and collect the located hazards (runs in the ML thread).
+        
+        Args:
+            entries: feedparser entries of one feed
+            published_since: Newest published date handled by earlier runs;
+                entries published at or before it are skipped
+            
+        Returns:
+            tuple: ((entry, content_data, classification, locations) candidates,
+                number of entries handled, number of entries that raised an
+                error, newest published date seen)
+        """
+        candidates = []
+        processed = 0
+        errors = 0
+        latest_published = published_since
+        # Per-entry messages are only formatted when someone will see them
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for entry in entries:
+            # FeedParserDict.get() goes through key aliasing - look up once
+            title = entry.get('title', 'Unknown')
+            try:
+                # Already handled by an earlier run - cheaper than any duplicate
+                # check. Entries are compared one by one rather than stopping at
+                # the first old one, since not every feed is sorted newest first.
+                published_at = self._parse_published_date(entry)
+                if published_at is not None:
+                    published_at = _as_utc(published_at)
+                    if published_since is not None and published_at <= published_since:
+                        continue
+                    if latest_published is None or published_at > latest_published:
+                        latest_published = published_at
+                processed += 1
                 
+                # Extract content
+                content_data = self._extract_content(entry)
+                content_data['published_at'] = published_at
+                
+                # Skip if no content
+                if not content_data['text'].strip():
+                    if debug:
+                        logger.debug(f"Skipping entry with no content: {title}")
+                    continue
+                
+                # A regex scan is far cheaper than a classifier forward pass
+                if self.keyword_prefilter and not HAZARD_KEYWORD_RE.search(content_data['text']):
+                    if debug:
+                        logger.debug(f"No hazard keywords, skipping classification: {title}")
+                    continue
+                
+                # Classify content
+                classification = classifier.classify(
+                    content_data['text'],
+                    threshold=self.classification_threshold
+                )
+                
+                # Only process if classified as hazard
+                if not classification['is_hazard']:
+                    if debug:
+                        logger.debug(f"Not classified as hazard: {title}")
+                    continue
+                
+                # Extract locations
+                locations = geo_ner.extract_locations(content_data['text'])
+                
+                # Only save if locations were found
+                if not locations:
+                    if debug:
+                        logger.debug(f"No locations found for: {title}")
+                    continue
+                
+                candidates.append((entry, content_data, classification, locations))
+                
+            except Exception as e:
+                logger.error(f"Error processing entry {entry.get('link', 'unknown')}: {str(e)}")
+                errors += 1
+                continue
+        
+        if processed < len(entries):
+            logger.debug(f"Skipped {len(entries) - processed} entries published before {published_since}")
+        return candidates, processed, errors, latest_published
+    
+    async def _store_feed(self, batch: Dict) -> Dict:
+        """
+        Second pipeline stage: drop duplicates and insert the feed's new hazards.
+        
+        Args:
+            batch: Result of _classify_feed()
+            
+        Returns:
+            dict: Processing results (see process_feed())
+        """
+        feed_url = batch['feed_url']
+        items_processed = batch['items_processed']
+        items_added = 0
+        duplicates_detected = 0
+        hazards_saved = []
+        # Rows waiting for the per-feed bulk insert, with their summaries
+        pending: List[Tuple[Dict, Dict]] = []
+        # Set when an entry may succeed on a retry (not stored, not a duplicate)
+        failed = False
+        # Per-hazard messages are logged at DEBUG; the feed summary stays at INFO
+        debug = logger.isEnabledFor(logging.DEBUG)
+        
+        try:
+            if batch['error_message'] is not None:
+                raise RuntimeError(batch['error_message'])
+            candidates = batch['candidates']
+            rss_threshold, _ = await self._load_confidence_thresholds()
+            
+            # Look up URL/content hash duplicates for all candidates at once
+            known = await asyncio.to_thread(self._prefetch_duplicate_index, candidates) if candidates else None
+            
+            for entry, content_data, classification, locations in candidates:
+                link = content_data['link']
+                title = content_data['title'] or 'Unknown'
                 try:
-                    # Extract content
-                    content_data = self._extract_content(entry)
+                    # Check for duplicates before saving
+                    is_duplicate, duplicate_id = await self._check_duplicate(
+                        link,
+                        content_data,
+                        locations[0] if locations else None,
+                        known
+                    )
                     
-                    # Skip if no content
-                    if not content_data['text'].strip():
-                        logger.debug(f"Skipping entry with no content: {entry.get('title', 'Unknown')}")
+                    if is_duplicate:
+                        if debug:
+                            logger.debug(f"Duplicate detected: {title} (matches {duplicate_id})")
+                        duplicates_detected += 1
+                        self.stats['duplicates_detected'] += 1
                         continue
                     
-                    # Classify content
-                    classification = classifier.classify(
-                        content_data['text'],
-                        threshold=self.classification_threshold
+                    # Build the row (saved with the rest of the feed below)
+                    hazard_row = self._build_hazard_row(
+                        entry,
+                        content_data,
+                        classification,
+                        locations,
+                        feed_url,
+                        rss_threshold
                     )
                     
-                    # Only process if classified as hazard
-                    if classification['is_hazard']:
-                        # Extract locations
-                        locations = geo_ner.extract_locations(content_data['text'])
-                        
-                        # Only save if locations were found
-                        if locations:
-                            # Check for duplicates before saving
-                            is_duplicate, duplicate_id = await self._check_duplicate(
-                                entry.get('link', ''),
-                                content_data,
-                                locations[0] if locations else None
-                            )
-                            
-                            if is_duplicate:
-                                logger.info(f"Duplicate detected: {entry.get('title', 'Unknown')} (matches {duplicate_id})")
-                                duplicates_detected += 1
-                                self.stats['duplicates_detected'] += 1
-                                continue
-                            
-                            # Save to database
-                            hazard_id = await self._save_hazard_to_db(
-                                entry,
-                                content_data,
-                                classification,
-                                locations,
-                                feed_url
-                            )
-                            
-                            if hazard_id:
-                                hazard_summary = {
-                                    'id': hazard_id,
-                                    'title': content_data['title'],
-                                    'hazard_type': classification['hazard_type'],
-                                    'confidence_score': classification['score'],
-                                    'location': locations[0] if locations else None
-                                }
-                                hazards_saved.append(hazard_summary)
-                                items_added += 1
-                                self.stats['total_stored'] += 1
-                                logger.info(f"✓ Saved hazard: {content_data['title']} (ID: {hazard_id})")
-                            else:
-                                logger.error(f"✗ Failed to save hazard: {entry.get('title', 'Unknown')}")
-                                self.stats['errors'] += 1
-                        else:
-                            logger.debug(f"No locations found for: {entry.get('title', 'Unknown')}")
-                    else:
-                        logger.debug(f"Not classified as hazard: {entry.get('title', 'Unknown')}")
-                        
+                    if hazard_row is None:
+                        logger.error(f"✗ Failed to save hazard: {title}")
+                        self.stats['errors'] += 1
+                        continue
+                    
+                    # Rows of this feed aren't in the database yet, so the
+                    # check above can't see them
+                    if self._is_pending_duplicate(hazard_row, pending):
+                        if debug:
+                            logger.debug(f"Duplicate detected: {title} (matches earlier entry in feed)")
+                        duplicates_detected += 1
+                        self.stats['duplicates_detected'] += 1
+                        continue
+                    
+                    hazard_summary = {
+                        'title': content_data['title'],
+                        'hazard_type': classification['hazard_type'],
+                        'confidence_score': classification['score'],
+                        'location': locations[0] if locations else None
+                    }
+                    pending.append((hazard_row, hazard_summary))
+                    
                 except Exception as e:
-                    logger.error(f"Error processing entry {entry.get('link', 'unknown')}: {str(e)}")
+                    logger.error(f"Error processing entry {link or 'unknown'}: {str(e)}")
                     self.stats['errors'] += 1
+                    failed = True
                     continue
             
+
+            # Save every new hazard of the feed in one bulk insert
+            if pending:
+                results = await asyncio.to_thread(self._flush_hazards, [row for row, _ in pending])
+                for (hazard_row, hazard_summary), (hazard_id, already_stored) in zip(pending, results):
+                    if already_stored:
+                        # Inserted by another run since the duplicate check
+                        if debug:
+                            logger.debug(f"Duplicate detected: {hazard_summary['title']} (source_url already stored)")
+                        duplicates_detected += 1
+                        self.stats['duplicates_detected'] += 1
+                    elif hazard_id:
+                        hazards_saved.append({'id': hazard_id, **hazard_summary})
+                        items_added += 1
+                        self.stats['total_stored'] += 1
+                        if debug:
+                            logger.debug(f"✓ Saved hazard: {hazard_summary['title']} (ID: {hazard_id})")
+                    else:
+                        logger.error(f"✗ Failed to save hazard: {hazard_summary['title']}")
+                        self.stats['errors'] += 1
+                        failed = True
+            
+            # Only advance the state once the feed's hazards are stored, so
+            # entries that failed are downloaded and handled again next run
+            state = batch['state']
+            if state is not None:
+                if failed:
+                    previous_state = batch['previous_state'] or {}
+                    state = {'last_published_at': previous_state.get('last_published_at')}
+                await asyncio.to_thread(
+                    self._save_feed_state,
+                    feed_url,
+                    state.get('etag'),
+                    state.get('modified'),
+                    state.get('last_published_at')
+                )
+            
             # Calculate processing time
-            processing_time = time.time() - start_time
+            processing_time = time.time() - batch['start_time']
             
             logger.info(f"Completed {feed_url}: {items_added}/{items_processed} hazards saved "
                        f"({duplicates_detected} duplicates)")
@@ -294,7 +723,7 @@ class RSSProcessorEnhanced:
             }
             
         except Exception as e:
-            processing_time = time.time() - start_time
+            processing_time = time.time() - batch['start_time']
             error_msg = str(e)
             
             logger.error(f"Error processing feed {feed_url}: {error_msg}")
@@ -321,8 +750,9 @@ class RSSProcessorEnhanced:
         Returns:
             dict: Extracted content with sanitized HTML
         """
-        # Get title
+        # Get title and link
         title = entry.get('title', '')
+        link = entry.get('link', '')
         
         # Get description/summary
         description = entry.get('summary', '') or entry.get('description', '')
@@ -341,6 +771,7 @@ class RSSProcessorEnhanced:
         
         return {
             'title': title,
+            'link': link,
             'description': description_clean,
             'content': content_clean,
             'text': full_text
@@ -359,38 +790,56 @@ class RSSProcessorEnhanced:
         if not html_text:
             return ''
         
-        # Parse and extract text only
-        soup = BeautifulSoup(html_text, 'html.parser')
-        text = soup.get_text(separator=' ', strip=True)
+        # lxml treats CDATA as a comment and drops its text - unwrap it first
+        if '<![CDATA[' in html_text:
+            html_text = _CDATA_RE.sub(r'\1', html_text)
         
-        # Remove extra whitespace
-        text = ' '.join(text.split())
+        # Parse and extract text only (lxml's C parser instead of BeautifulSoup's
+        # pure-Python html.parser; script/style content is never article text)
+        try:
+            root = lxml.html.fragment_fromstring(html_text, create_parent='div')
+            etree.strip_elements(root, 'script', 'style', with_tail=False)
+            text = ' '.join(root.itertext())
+        except (etree.ParserError, ValueError):
+            # Not parseable as HTML - drop anything tag-like
+            text = re.sub(r'<[^>]*>', ' ', html_text)
         
-        return text
+        # Remove extra whitespace
+        return _WHITESPACE_RE.sub(' ', text).strip()
     
     def _generate_content_hash(self, content_data: Dict) -> str:
         """
         Generate SHA-256 hash of content for duplicate detection.
         
+        The hash is stored in content_data, so the duplicate prefetch, the
+        duplicate check and the row builder share one computation.
+        
         Args:
             content_data: Extracted content dict
             
         Returns:
             str: SHA-256 hash (64 characters)
         """
+        content_hash = content_data.get('content_hash')
+        if content_hash is not None:
+            return content_hash
+        
         # Combine title and description for hashing
         combined_text = f"{content_data['title']}{content_data['description']}"
         
         # Normalize: lowercase, remove extra whitespace
-        normalized = ' '.join(combined_text.lower().split())
+        normalized = _WHITESPACE_RE.sub(' ', combined_text.lower()).strip()
         
         # Generate hash
-        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+        content_hash = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+        content_data['content_hash'] = content_hash
+        return content_hash
     
     def _validate_url(self, url: str) -> bool:
         """
         Validate RSS feed URL for security.
-        Blocks localhost, private IPs, and invalid schemes.
+        Blocks localhost, hosts resolving to non-public addresses (private,
+        loopback, link-local, CGNAT, reserved - IPv4 and IPv6), and invalid schemes.
         
         Args:
             url: URL to validate
@@ -409,19 +858,22 @@ class RSSProcessorEnhanced:
                 return False
             
             # Only allow http/https
-            if parsed.scheme not in ['http', 'https']:
+            if parsed.scheme not in _ALLOWED_URL_SCHEMES:
                 logger.warning(f"Blocked non-HTTP scheme: {url}")
                 return False
             
-            # Block localhost and private IPs (security)
-            blocked_hosts = ['localhost', '127.0.0.1', '0.0.0.0', '::1']
-            if any(blocked in parsed.netloc.lower() for blocked in blocked_hosts):
+            hostname = parsed.hostname
+            if not hostname:
+                return False
+            
+            # Block localhost (security)
+            if hostname == 'localhost' or hostname.endswith('.localhost'):
                 logger.warning(f"Blocked localhost URL: {url}")
                 return False
             
-            # Block private IP ranges (basic check)
-            if re.match(r'^(10|172\.(1[6-9]|2[0-9]|3[01])|192\.168)\.', parsed.netloc):
-                logger.warning(f"Blocked private IP: {url}")
+            # Block anything that is or resolves to a non-public IP (SSRF)
+            if not is_public_host(hostname):
+                logger.warning(f"Blocked non-public address: {url}")
                 return False
             
             return True
@@ -430,11 +882,59 @@ class RSSProcessorEnhanced:
             logger.error(f"URL validation error: {str(e)}")
             return False
     
+    def _prefetch_duplicate_index(
+        self,
+        candidates: List[Tuple[feedparser.FeedParserDict, Dict, Dict, List[Dict]]]
+    ) -> Optional[Tuple[Dict[str, str], Dict[str, str]]]:
+        """
+        Fetch existing hazards matching the candidates' URLs or content hashes.
+        
+        Replaces the per-entry URL and content hash queries of _check_duplicate
+        with a few IN queries per feed (DUPLICATE_PREFETCH_CHUNK keys each, to
+        keep the request URL short).
+        
+        Args:
+            candidates: (entry, content_data, classification, locations) tuples
+            
+        Returns:
+            tuple: (source_url -> hazard id, content_hash -> hazard id), or None
+                if the lookup failed (callers then query per entry)
+        """
+        urls = list({content_data['link'] for _, content_data, *_ in candidates} - {''})
+        hashes = list({self._generate_content_hash(content_data) for _, content_data, *_ in candidates})
+        time_threshold = datetime.now(timezone.utc) - timedelta(hours=self.duplicate_time_window)
+        
+        known_urls: Dict[str, str] = {}
+        known_hashes: Dict[str, str] = {}
+        try:
+            for i in range(0, len(urls), DUPLICATE_PREFETCH_CHUNK):
+                response = supabase.schema('gaia').from_('hazards') \
+                    .select('id, source_url') \
+                    .in_('source_url', urls[i:i + DUPLICATE_PREFETCH_CHUNK]) \
+                    .execute()
+                for row in response.data or []:
+                    known_urls.setdefault(row['source_url'], row['id'])
+            
+            for i in range(0, len(hashes), DUPLICATE_PREFETCH_CHUNK):
+                response = supabase.schema('gaia').from_('hazards') \
+                    .select('id, content_hash') \
+                    .in_('content_hash', hashes[i:i + DUPLICATE_PREFETCH_CHUNK]) \
+                    .gte('detected_at', time_threshold.isoformat()) \
+                    .execute()
+                for row in response.data or []:
+                    known_hashes.setdefault(row['content_hash'], row['id'])
+        except Exception as e:
+            logger.error(f"Duplicate prefetch error: {str(e)}")
+            return None
+        
+        return known_urls, known_hashes
+    
     async def _check_duplicate(
         self,
         url: str,
         content_data: Dict,
-        location: Optional[Dict]
+        location: Optional[Dict],
+        known: Optional[Tuple[Dict[str, str], Dict[str, str]]] = None
     ) -> Tuple[bool, Optional[str]]:
         """
         Check if hazard already exists in database using multiple strategies.
@@ -448,11 +948,22 @@ class RSSProcessorEnhanced:
             url: Article URL
             content_data: Extracted content
             location: Primary location from Geo-NER
+            known: Result of _prefetch_duplicate_index() (strategies 1 and 2 are
+                then answered from memory instead of queried)
             
         Returns:
             tuple: (is_duplicate: bool, duplicate_id: str | None)
         """
         try:
+            if known is not None:
+                known_urls, known_hashes = known
+                if url and url in known_urls:
+                    return True, known_urls[url]
+                content_hash = self._generate_content_hash(content_data)
+                if content_hash in known_hashes:
+                    return True, known_hashes[content_hash]
+                return await self._check_nearby_duplicate(location)
+            
             # Strategy 1: Check URL (fastest)
             if url:
                 response = supabase.schema('gaia').from_('hazards').select('id').eq('source_url', url).limit(1).execute()
@@ -461,7 +972,7 @@ class RSSProcessorEnhanced:
             
             # Strategy 2: Check content hash within time window
             content_hash = self._generate_content_hash(content_data)
-            time_threshold = datetime.utcnow() - timedelta(hours=self.duplicate_time_window)
+            time_threshold = datetime.now(timezone.utc) - timedelta(hours=self.duplicate_time_window)
             
             response = supabase.schema('gaia').from_('hazards') \
                 .select('id') \
@@ -473,22 +984,42 @@ class RSSProcessorEnhanced:
             if response.data:
                 return True, response.data[0]['id']
             
+            return await self._check_nearby_duplicate(location)
+            
+        except Exception as e:
+            logger.error(f"Duplicate check error: {str(e)}", exc_info=True)
+            # On error, assume not duplicate (conservative approach - avoid false positives)
+            return False, None
+    
+    async def _check_nearby_duplicate(self, location: Optional[Dict]) -> Tuple[bool, Optional[str]]:
+        """
+        Duplicate strategy 3: a hazard within DUPLICATE_RADIUS_KM in the time window.
+        
+        Args:
+            location: Primary location from Geo-NER
+            
+        Returns:
+            tuple: (is_duplicate: bool, duplicate_id: str | None)
+        """
+        try:
             # Strategy 3: Location + time window (within 5km radius)
             if location and location.get('latitude') and location.get('longitude'):
-                # Use PostGIS function to find nearby hazards
-                response = supabase.schema('gaia').rpc(
-                    'get_nearby_hazards',
+                # PostGIS lookup (ST_DWithin on the location GiST index), returns
+                # the id of one nearby hazard or null
+                query = supabase.schema('gaia').rpc(
+                    'find_nearby_hazard',
                     {
                         'ref_lat': location['latitude'],
                         'ref_lng': location['longitude'],
-                        'radius_km': 5.0,
+                        'radius_km': DUPLICATE_RADIUS_KM,
                         'time_window_hours': self.duplicate_time_window
                     }
-                ).execute()
+                )
+                response = await asyncio.to_thread(query.execute)
                 
                 if response.data:
-                    # Found nearby hazards, likely duplicate
-                    return True, response.data[0]['hazard_id']
+                    # Found a nearby hazard, likely duplicate
+                    return True, response.data
             
             return False, None
             
@@ -497,16 +1028,131 @@ class RSSProcessorEnhanced:
             # On error, assume not duplicate (conservative approach - avoid false positives)
             return False, None
     
-    async def _save_hazard_to_db(
+    def _is_pending_duplicate(self, hazard_row: Dict, pending: List[Tuple[Dict, Dict]]) -> bool:
+        """
+        Apply the _check_duplicate strategies to rows not yet inserted.
+        
+        Args:
+            hazard_row: Row from _build_hazard_row()
+            pending: Rows of the current feed waiting to be inserted
+            
+        Returns:
+            bool: True if the row duplicates a pending row
+        """
+        for other, _ in pending:
+            if hazard_row['source_url'] and hazard_row['source_url'] == other['source_url']:
+                return True
+            if hazard_row['content_hash'] == other['content_hash']:
+                return True
+            if _distance_km(hazard_row['latitude'], hazard_row['longitude'],
+                            other['latitude'], other['longitude']) <= DUPLICATE_RADIUS_KM:
+                return True
+        return False
+    
+    def _flush_hazards(self, rows: List[Dict]) -> List[Tuple[Optional[str], bool]]:
+        """
+        Insert hazard rows into gaia.hazards with a single request.
+        
+        The insert is an upsert on the unique source_url index that ignores
+        conflicts, so an article stored by a concurrent run since the duplicate
+        check is skipped by the database instead of inserted twice.
+        
+        If the bulk insert fails, rows are retried one at a time so a single bad
+        row doesn't lose the rest of the feed.
+        
+        Args:
+            rows: Rows from _build_hazard_row()
+            
+        Returns:
+            list: (hazard UUID or None, already_stored) per row, in row order.
+                The UUID is None where the insert failed or the source_url
+                already existed (already_stored is True).
+        """
+        try:
+            response = supabase.schema('gaia').from_('hazards') \
+                .upsert(rows, on_conflict='source_url', ignore_duplicates=True) \
+                .execute()
+            
+            # PostgREST returns the inserted rows in request order and leaves out
+            # the skipped ones (source_url is unique within a feed's rows)
+            inserted = iter(response.data or [])
+            row_inserted = next(inserted, None)
+            results = []
+            for row in rows:
+                if row_inserted is not None and row_inserted.get('source_url') == row['source_url']:
+                    results.append((row_inserted['id'], False))
+                    row_inserted = next(inserted, None)
+                else:
+                    results.append((None, True))
+            
+            if row_inserted is None:
+                stored = sum(1 for hazard_id, _ in results if hazard_id)
+                logger.info(f"Database insert successful: {stored} hazard(s), "
+                            f"{len(rows) - stored} already stored")
+                return results
+            logger.error(f"Bulk insert returned rows that don't match the request ({len(rows)} rows)")
+        except Exception as e:
+            if len(rows) == 1:
+                logger.error(f"Error saving hazard to database: {str(e)}", exc_info=True)
+                return [(None, False)]
+            logger.warning(f"Bulk insert of {len(rows)} hazards failed ({str(e)}), retrying one by one")
+        
+        if len(rows) == 1:
+            return [(None, False)]
+        
+        results = []
+        for row in rows:
+            results.extend(self._flush_hazards([row]))
+        return results
+    
+    def _parse_published_date(self, entry: feedparser.FeedParserDict) -> Optional[datetime]:
+        """
+        Get an entry's published date, trying the cheapest parser first.
+        
+        feedparser's published_parsed is free; otherwise RSS dates are RFC 2822
+        and Atom dates ISO 8601, both parsed natively. dateutil, which tries many
+        formats, is only the last resort.
+        
+        Args:
+            entry: RSS entry
+            
+        Returns:
+            datetime: Published date, or None if missing or unparseable
+        """
+        published_parsed = entry.get('published_parsed')
+        if published_parsed:
+            return datetime(*published_parsed[:6])
+        
+        published = entry.get('published')
+        if not published:
+            return None
+        
+        try:
+            return parsedate_to_datetime(published)
+        except (TypeError, ValueError, IndexError):
+            pass
+        
+        try:
+            return datetime.fromisoformat(published.replace('Z', '+00:00'))
+        except ValueError:
+            pass
+        
+        try:
+            return date_parser.parse(published)
+        except (ValueError, OverflowError):
+            return None
+    
+    def _build_hazard_row(
         self,
         entry: feedparser.FeedParserDict,
         content_data: Dict,
         classification: Dict,
         locations: List[Dict],
-        feed_url: str
-    ) -> Optional[str]:
+        feed_url: str,
+        rss_threshold: float
+    ) -> Optional[Dict]:
         """
-        Save hazard to Supabase gaia.hazards table.
+        Build a gaia.hazards row for a classified entry.
         
         Args:
             entry: RSS entry
@@ -514,20 +1160,17 @@ class RSSProcessorEnhanced:
             classification: Classification result
             locations: Extracted locations
             feed_url: Source feed URL
+            rss_threshold: Confidence at or above which the hazard is auto-validated
             
         Returns:
-            str: Hazard UUID if successful, None otherwise
+            dict: Row ready for insertion, or None if no usable location
         """
         try:
-            # Parse published date
-            published_date = None
-            if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                published_date = datetime(*entry.published_parsed[:6])
-            elif hasattr(entry, 'published'):
-                try:
-                    published_date = date_parser.parse(entry.published)
-                except:
-                    pass
+            # Published date (already parsed by _classify_entries)
+            if 'published_at' in content_data:
+                published_date = content_data['published_at']
+            else:
+                published_date = self._parse_published_date(entry)
             
             # Use primary location (first one with coordinates)
             primary_location = None
@@ -552,30 +1195,20 @@ class RSSProcessorEnhanced:
             content_hash = self._generate_content_hash(content_data)
             
             # Map classifier output to database enum values
-            hazard_type_mapping = {
-                'flooding': 'flood',
-                'fire': 'fire',
-                'earthquake': 'earthquake',
-                'typhoon': 'typhoon',
-                'landslide': 'landslide',
-                'volcanic eruption': 'volcanic_eruption',
-                'drought': 'drought',
-                'tsunami': 'tsunami',
-                'storm surge': 'storm_surge',
-                'tornado': 'tornado'
-            }
-            db_hazard_type = hazard_type_mapping.get(
+            db_hazard_type = HAZARD_TYPE_MAP.get(
                 classification['hazard_type'].lower(),
                 'other'  # Default if not found
             )
             
-            # Fetch confidence thresholds and determine auto-validation
-            rss_threshold, _ = self._get_confidence_thresholds()
+            # Determine auto-validation
             confidence_score = classification['score']
             auto_validated = confidence_score >= rss_threshold
             
-            if auto_validated:
-                logger.info(f"Auto-validating hazard (confidence: {confidence_score:.4f} >= threshold: {rss_threshold})")
+            if auto_validated and logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Auto-validating hazard (confidence: {confidence_score:.4f} >= threshold: {rss_threshold})")
+            
+            # One timestamp for detection and auto-validation
+            now = datetime.now(timezone.utc).isoformat()
             
             # Build hazard data for database
             hazard_data = {
@@ -588,33 +1221,24 @@ class RSSProcessorEnhanced:
                 'location_name': primary_location.get('location_name', ''),
                 'admin_division': primary_location.get('province', '') or primary_location.get('city', ''),
                 'confidence_score': confidence_score,
-                'model_version': classifier.get_active_model(),
+                'model_version': self._get_active_model(),
                 'source_type': 'rss',
-                'source_url': entry.get('link', ''),
+                'source_url': content_data['link'] or None,
                 'source_title': content_data['title'],
                 'source_content': content_data['text'][:1000],  # Limit to 1000 chars
                 'source_published_at': published_date.isoformat() if published_date else None,
                 'validated': auto_validated,  # Auto-validate if above threshold
-                'validated_at': datetime.utcnow().isoformat() if auto_validated else None,
+                'validated_at': now if auto_validated else None,
                 'validation_notes': f'Auto-validated (confidence {confidence_score:.4f} >= {rss_threshold})' if auto_validated else None,
-                'detected_at': datetime.utcnow().isoformat(),
+                'detected_at': now,
                 'content_hash': content_hash,
                 'source': feed_url  # Track which feed it came from
             }
             
-            # Insert into database
-            response = supabase.schema('gaia').from_('hazards').insert(hazard_data).execute()
-            
-            if response.data and len(response.data) > 0:
-                hazard_id = response.data[0]['id']
-                logger.info(f"Database insert successful: {hazard_id}")
-                return hazard_id
-            else:
-                logger.error(f"Database insert returned no data")
-                return None
+            return hazard_data
             
         except Exception as e:
-            logger.error(f"Error saving hazard to database: {str(e)}", exc_info=True)
+            logger.error(f"Error building hazard row: {str(e)}", exc_info=True)
             return None
     
     def get_statistics(self) -> Dict:
@@ -639,5 +1263,19 @@ class RSSProcessorEnhanced:
         }
 
 
+def _as_utc(value: datetime) -> datetime:
+    """Make a datetime timezone-aware, reading naive values as UTC"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle (haversine) distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * 6371.0 * math.asin(math.sqrt(a))
+
+
 # Global enhanced RSS processor instance
 rss_processor_enhanced = RSSProcessorEnhanced()
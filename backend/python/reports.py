@@ -11,6 +11,7 @@ Change: add-advanced-map-features (Phase 4)
 Dependencies:
 - reportlab: PDF generation
 - Pillow (PIL): Image processing
+- pybase64 (optional): SIMD base64 decoding of map screenshots
 - FastAPI: Web framework
 - Pydantic: Data validation
 """
@@ -23,7 +24,7 @@ from datetime import datetime
 from pathlib import Path
 import tempfile
 import io
-import base64
+import binascii
 
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.units import inch, cm
@@ -43,10 +44,26 @@ from reportlab.pdfgen import canvas
 from PIL import Image
 import os
 
+# SIMD-accelerated base64 decoding when pybase64 is installed; binascii (the
+# decoder behind base64.b64decode) otherwise. Both skip non-alphabet characters.
+try:
+    import pybase64
+    
+    def _b64decode(data) -> bytes:
+        return pybase64.b64decode(data, validate=False)
+except ImportError:
+    _b64decode = binascii.a2b_base64
+
 # Router prefix: main.py adds /api/v1, so this becomes /api/v1/reports
 router = APIRouter(prefix="/reports", tags=["reports"])
 global_img_path = Path(__file__).parent / 'assets' / 'img' / 'GAIA.png'
 
+# Name of the form XObject holding the page header
+HEADER_FORM_NAME = 'gaia_header'
+
+# Resolution the map screenshot is downscaled to for its size on the page
+MAP_IMAGE_DPI = 150
+
 # ============================================================================
 # DATA MODELS
 # ============================================================================
@@ -83,16 +100,14 @@ class ReportRequest(BaseModel):
 # PDF GENERATION FUNCTIONS
 # ============================================================================
 
-def create_header_footer(canvas_obj, doc):
+def draw_header(canvas_obj, doc):
     """
-    Add header and footer to each page
+    Draw the page header (logo, title and subtitle)
     
     Args:
         canvas_obj: ReportLab canvas object
         doc: Document template
     """
-    canvas_obj.saveState()
-    
     global global_img_path
 
     # Try to add logo in header
@@ -126,6 +141,26 @@ def create_header_footer(canvas_obj, doc):
         canvas_obj.setFont('Helvetica', 8)
         canvas_obj.setFillColor(colors.grey)
         canvas_obj.drawString(0.75*inch, doc.height + doc.topMargin - 0.5*inch, "Geospatial AI-driven Assessment")
+
+def create_header_footer(canvas_obj, doc):
+    """
+    Add header and footer to each page
+    
+    The header is identical on every page, so it is drawn once into a PDF form
+    XObject and each page only references it (the logo is read and embedded
+    once per report instead of once per page).
+    
+    Args:
+        canvas_obj: ReportLab canvas object
+        doc: Document template
+    """
+    canvas_obj.saveState()
+    
+    if not canvas_obj.hasForm(HEADER_FORM_NAME):
+        canvas_obj.beginForm(HEADER_FORM_NAME)
+        draw_header(canvas_obj, doc)
+        canvas_obj.endForm()
+    canvas_obj.doForm(HEADER_FORM_NAME)
     
     # Footer
     canvas_obj.setFont('Helvetica', 8)
@@ -150,12 +185,14 @@ def decode_base64_image(base64_string: str) -> io.BytesIO:
     Returns:
         BytesIO object containing image data
     """
-    # Remove data URL prefix if present
-    if ',' in base64_string:
-        base64_string = base64_string.split(',')[1]
-    
-    # Decode base64
-    image_data = base64.b64decode(base64_string)
+    # Skip the data URL prefix if present. Slicing from the first comma copies
+    # the payload once (none without a prefix) where split() copied every part;
+    # both decoders take the ASCII str directly, so there is no encode() copy.
+    # Non-ASCII input raises ValueError, as base64.b64decode did.
+    payload = base64_string[base64_string.find(',') + 1:]
+    
+    # Decode base64 (non-strict, like base64.b64decode)
+    image_data = _b64decode(payload)
     return io.BytesIO(image_data)
 
 def create_hazard_table(hazards: List[HazardData], styles) -> Table:
@@ -370,6 +407,22 @@ def generate_pdf_report(
                 img_height = max_height
                 img_width = img_height / aspect
             
+            # Screenshots are often far larger (e.g. 4K) than the space they
+            # fill - downscale to MAP_IMAGE_DPI so ReportLab embeds fewer pixels
+            target_px_w = int(img_width / inch * MAP_IMAGE_DPI)
+            target_px_h = int(img_height / inch * MAP_IMAGE_DPI)
+            if pil_image.width > target_px_w * 1.2:
+                image_format = pil_image.format
+                pil_image.thumbnail((target_px_w, target_px_h), Image.Resampling.LANCZOS)
+                resized_io = io.BytesIO()
+                if image_format == 'JPEG':
+                    pil_image.save(resized_io, format='JPEG', quality=85)
+                else:
+                    # Intermediate buffer only: ReportLab decodes and re-compresses
+                    # the pixels when embedding, so spend little CPU on zlib here
+                    pil_image.save(resized_io, format='PNG', compress_level=1)
+                image_io = resized_io
+            
             # Reset BytesIO position
             image_io.seek(0)
             
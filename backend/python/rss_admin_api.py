@@ -9,6 +9,7 @@ Security:
 - Rate limiting on processing endpoints
 """
 
+import asyncio
 import os
 import logging
 from datetime import datetime, timedelta
@@ -34,6 +35,10 @@ logger = logging.getLogger(__name__)
 # Initialize router
 router = APIRouter(prefix="/admin/rss", tags=["RSS Management"])
 
+# Feed URLs containing any of these are rejected (the processor additionally
+# resolves feed hosts and blocks every non-public address)
+BLOCKED_FEED_HOSTS = ('localhost', '127.0.0.1', '0.0.0.0', '::1')
+
 
 # ============================================================================
 # PYDANTIC MODELS
@@ -55,7 +60,8 @@ class RSSFeedCreate(BaseModel):
         if not url_str.startswith(('http://', 'https://')):
             raise ValueError('Feed URL must use HTTP or HTTPS protocol')
         # Block localhost and private IPs
-        if any(blocked in url_str.lower() for blocked in ['localhost', '127.0.0.1', '0.0.0.0', '::1']):
+        url_lower = url_str.lower()
+        if any(blocked in url_lower for blocked in BLOCKED_FEED_HOSTS):
             raise ValueError('Localhost URLs are not allowed')
         return v
 
@@ -347,8 +353,9 @@ async def process_rss_feeds(
         # Extract feed URLs
         feed_urls = [feed['feed_url'] for feed in feeds]
         
-        # Process feeds using enhanced processor
-        rss_processor_enhanced.set_feeds(feed_urls)
+        # Process feeds using enhanced processor (URL validation resolves each
+        # feed host with blocking DNS lookups - keep it off the event loop)
+        await asyncio.to_thread(rss_processor_enhanced.set_feeds, feed_urls)
         results = await rss_processor_enhanced.process_all_feeds()
         
         # Save processing logs to database
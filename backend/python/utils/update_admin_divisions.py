@@ -15,8 +15,8 @@ sys.path.insert(0, project_root)
 
 from backend.python.philippine_regions import (
     get_region_from_location,
-    PHILIPPINE_ADMIN_MAPPING,
-    PROVINCE_TO_REGION
+    resolve_city,
+    resolve_province
 )
 from backend.python.lib.supabase_client import supabase
 
@@ -43,24 +43,23 @@ def extract_location_parts(location_name: str) -> dict:
     location_clean = location_name.strip()
     
     # Try direct city match (case-insensitive)
-    for city_key in PHILIPPINE_ADMIN_MAPPING.keys():
-        if city_key.lower() == location_clean.lower():
-            return {'city': city_key, 'province': None}
+    city_key = resolve_city(location_clean)
+    if city_key is not None:
+        return {'city': city_key, 'province': None}
     
     # Try direct province match
-    for province_key in PROVINCE_TO_REGION.keys():
-        if province_key.lower() == location_clean.lower():
-            return {'city': None, 'province': province_key}
+    province_key = resolve_province(location_clean)
+    if province_key is not None:
+        return {'city': None, 'province': province_key}
     
     # Try partial matches (for multi-word locations)
     # Example: "Bais City" should match if "Bais" is not found
     words = location_clean.split()
     if len(words) > 1:
         # Try without last word (City, Municipality, etc.)
-        without_suffix = ' '.join(words[:-1])
-        for city_key in PHILIPPINE_ADMIN_MAPPING.keys():
-            if city_key.lower() == without_suffix.lower():
-                return {'city': city_key, 'province': None}
+        city_key = resolve_city(' '.join(words[:-1]))
+        if city_key is not None:
+            return {'city': city_key, 'province': None}
     
     return {'city': location_clean, 'province': None}
 
@@ -0,0 +1,39 @@
+-- Index citizen_reports.tracking_id for the public /citizen-reports/track lookup
+-- backend/python/citizen_reports.py looks reports up with
+-- .eq("tracking_id", ...), which otherwise scans the whole table. No INCLUDE
+-- columns: TRACKING_COLUMNS selects description and notes, free text that
+-- would bloat the index, and a single-row lookup costs one heap fetch anyway.
+--
+-- Tracking ids are generated to be unique (CR<date><8 hex>), so the index is
+-- UNIQUE. Existing rows are checked first: if any tracking_id is already
+-- repeated, the migration still indexes the column (non-unique) and reports
+-- the duplicates instead of failing, so the reports can be reviewed by hand.
+
+BEGIN;
+
+DO $$
+DECLARE
+    duplicate_ids integer;
+BEGIN
+    SELECT count(*) INTO duplicate_ids
+    FROM (
+        SELECT tracking_id
+        FROM gaia.citizen_reports
+        WHERE tracking_id IS NOT NULL
+        GROUP BY tracking_id
+        HAVING count(*) > 1
+    ) d;
+
+    IF duplicate_ids = 0 THEN
+        CREATE UNIQUE INDEX IF NOT EXISTS citizen_reports_tracking_id_idx
+            ON gaia.citizen_reports (tracking_id);
+    ELSE
+        RAISE WARNING 'gaia.citizen_reports has % repeated tracking_id value(s); '
+            'creating a non-unique citizen_reports_tracking_id_idx', duplicate_ids;
+        CREATE INDEX IF NOT EXISTS citizen_reports_tracking_id_idx
+            ON gaia.citizen_reports (tracking_id);
+    END IF;
+END
+$$;
+
+COMMIT;
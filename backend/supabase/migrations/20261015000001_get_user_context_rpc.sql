@@ -0,0 +1,40 @@
+-- Single-round-trip authentication lookup for backend RBAC (AC-03)
+-- Returns the user's profile fields together with their role's permissions,
+-- replacing separate user_profiles and role_permissions selects in
+-- backend/python/middleware/rbac.py (get_current_user).
+--
+-- rbac.py keeps an in-memory role -> permissions map (refreshed every
+-- ROLE_PERMISSIONS_TTL seconds) and only asks for permissions
+-- (include_permissions => true) while that map is unavailable.
+
+CREATE OR REPLACE FUNCTION gaia.get_user_context(uid uuid, include_permissions boolean DEFAULT true)
+RETURNS TABLE (
+    role text,
+    status text,
+    full_name text,
+    organization text,
+    permissions text[]
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        p.role::text,
+        p.status::text,
+        p.full_name,
+        p.organization,
+        CASE WHEN include_permissions THEN
+            COALESCE(
+                (SELECT array_agg(rp.permission_name::text)
+                 FROM gaia.role_permissions rp
+                 WHERE rp.role = p.role),
+                ARRAY[]::text[]
+            )
+        END AS permissions
+    FROM gaia.user_profiles p
+    WHERE p.id = uid;
+$$;
+
+-- Functions are executable by PUBLIC by default; only the backend may call this
+REVOKE EXECUTE ON FUNCTION gaia.get_user_context(uuid, boolean) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION gaia.get_user_context(uuid, boolean) TO service_role;
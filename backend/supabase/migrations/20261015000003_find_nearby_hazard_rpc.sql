@@ -0,0 +1,40 @@
+-- Index-backed proximity lookup for RSS duplicate detection (RSS-08)
+-- backend/python/pipeline/rss_processor_enhanced.py only needs to know whether
+-- *a* hazard exists within radius_km in the duplicate time window, so this
+-- returns the first match instead of every nearby hazard.
+--
+-- hazards.location is geometry(4326); distance in metres needs geography, so
+-- the GiST index is on the same location::geography expression the query uses.
+-- ST_DWithin lets the planner use that index as a bounding-box prefilter, and
+-- the detected_at btree covers the time window.
+
+CREATE INDEX IF NOT EXISTS hazards_location_geog_gix
+    ON gaia.hazards USING GIST ((location::geography));
+
+CREATE INDEX IF NOT EXISTS hazards_detected_at_idx
+    ON gaia.hazards (detected_at);
+
+CREATE OR REPLACE FUNCTION gaia.find_nearby_hazard(
+    ref_lat double precision,
+    ref_lng double precision,
+    radius_km double precision DEFAULT 5.0,
+    time_window_hours integer DEFAULT 48
+)
+RETURNS uuid
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT h.id
+    FROM gaia.hazards h
+    WHERE h.detected_at >= now() - make_interval(hours => time_window_hours)
+      AND ST_DWithin(
+          h.location::geography,
+          ST_SetSRID(ST_MakePoint(ref_lng, ref_lat), 4326)::geography,
+          radius_km * 1000
+      )
+    LIMIT 1;
+$$;
+
+-- Functions are executable by PUBLIC by default; only the backend may call this
+REVOKE EXECUTE ON FUNCTION gaia.find_nearby_hazard(double precision, double precision, double precision, integer) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION gaia.find_nearby_hazard(double precision, double precision, double precision, integer) TO service_role;
@@ -0,0 +1,50 @@
+-- Database-enforced duplicate protection for RSS hazards (RSS-08)
+-- backend/python/pipeline/rss_processor_enhanced.py inserts hazards with
+-- upsert(on_conflict='source_url', ignore_duplicates=True), i.e.
+-- INSERT ... ON CONFLICT (source_url) DO NOTHING. That needs a unique index on
+-- source_url; hazards without an article URL store NULL, which never conflicts.
+--
+-- Earlier RSS rows stored '' for entries without a link, and concurrent runs
+-- could store the same article twice. Empty URLs become NULL. For repeated
+-- URLs the earliest row (by detected_at, undated rows last, then id) keeps
+-- source_url; later copies keep their URL in duplicate_source_url, so no
+-- provenance is lost and the moved rows can be found again.
+
+BEGIN;
+
+ALTER TABLE gaia.hazards
+    ADD COLUMN IF NOT EXISTS duplicate_source_url text;
+
+COMMENT ON COLUMN gaia.hazards.duplicate_source_url IS
+    'source_url of a hazard that repeats an article already stored by an earlier hazard '
+    '(moved out of source_url by migration 20261015000004 to build hazards_source_url_key)';
+
+UPDATE gaia.hazards
+SET source_url = NULL
+WHERE source_url = '';
+
+WITH ranked AS (
+    SELECT
+        id,
+        row_number() OVER (
+            PARTITION BY source_url
+            ORDER BY detected_at ASC NULLS LAST, id
+        ) AS copy_number
+    FROM gaia.hazards
+    WHERE source_url IS NOT NULL
+)
+UPDATE gaia.hazards h
+SET duplicate_source_url = h.source_url,
+    source_url = NULL
+FROM ranked r
+WHERE h.id = r.id
+  AND r.copy_number > 1;
+
+CREATE UNIQUE INDEX IF NOT EXISTS hazards_source_url_key
+    ON gaia.hazards (source_url);
+
+-- Content hash duplicate lookups (not unique: the check is time-windowed)
+CREATE INDEX IF NOT EXISTS hazards_content_hash_idx
+    ON gaia.hazards (content_hash);
+
+COMMIT;
@@ -0,0 +1,18 @@
+-- Per-feed HTTP cache validators for RSS processing (RSS-08)
+-- backend/python/pipeline/rss_processor_enhanced.py sends the ETag and
+-- Last-Modified values of a feed's previous download as If-None-Match /
+-- If-Modified-Since, so an unchanged feed answers 304 and is neither
+-- downloaded nor parsed. Keyed by URL because processed feeds are not
+-- necessarily rows of gaia.rss_feeds (e.g. the default feeds).
+
+CREATE TABLE IF NOT EXISTS gaia.rss_feed_state (
+    feed_url text PRIMARY KEY,
+    etag text,
+    last_modified text,
+    last_checked timestamptz NOT NULL DEFAULT now()
+);
+
+-- Only the backend (service role, which bypasses RLS) reads or writes it
+ALTER TABLE gaia.rss_feed_state ENABLE ROW LEVEL SECURITY;
+
+GRANT SELECT, INSERT, UPDATE, DELETE ON gaia.rss_feed_state TO service_role;
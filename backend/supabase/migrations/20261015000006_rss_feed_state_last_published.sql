@@ -0,0 +1,8 @@
+-- Published-date boundary for incremental RSS processing (RSS-08)
+-- backend/python/pipeline/rss_processor_enhanced.py stores the newest entry
+-- published date it has handled per feed, and skips entries published at or
+-- before it on later runs instead of sending them through classification and
+-- duplicate checks again. NULL (new feed, or no dated entries) skips nothing.
+
+ALTER TABLE gaia.rss_feed_state
+    ADD COLUMN IF NOT EXISTS last_published_at timestamptz;
@@ -0,0 +1,196 @@
+"""
+Unit tests for the RSS/Atom feed fetcher.
+
+Tests cover:
+- Parsing a downloaded feed and reporting its cache validators
+- Conditional requests and 304 Not Modified handling
+- The MAX_FEED_BYTES response size cap
+- Redirect validation (non-public targets are refused)
+"""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from backend.python.pipeline import feed_fetcher
+from backend.python.pipeline.feed_fetcher import (
+    create_feed_client,
+    fetch_feed,
+    is_public_host,
+)
+
+
+RSS_BODY = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>PAGASA</title>
+<item><title>Typhoon signal raised</title><link>https://example.com/1</link></item>
+<item><title>Flood warning</title><link>https://example.com/2</link></item>
+</channel></rss>"""
+
+
+def _client(handler):
+    """Feed client whose requests are answered by handler instead of the network"""
+    client = create_feed_client()
+    client._transport = httpx.MockTransport(handler)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def public_hosts():
+    """Treat the test hostnames as public without DNS lookups"""
+    with patch.dict(feed_fetcher._host_checks, {"feeds.example.com": True, "cdn.example.com": True}):
+        yield
+
+
+class TestFetchFeed:
+    """Tests for fetch_feed downloads."""
+
+    @pytest.mark.asyncio
+    async def test_parses_entries_and_validators(self):
+        """Test entries are parsed and ETag/Last-Modified are returned."""
+        def handler(request):
+            return httpx.Response(
+                200,
+                content=RSS_BODY,
+                headers={"ETag": '"v1"', "Last-Modified": "Wed, 14 Oct 2026 08:00:00 GMT"},
+            )
+
+        async with _client(handler) as client:
+            feed = await fetch_feed("https://feeds.example.com/rss", client)
+
+        assert feed.status == 200
+        assert [entry.title for entry in feed.entries] == ["Typhoon signal raised", "Flood warning"]
+        assert feed.etag == '"v1"'
+        assert feed.modified == "Wed, 14 Oct 2026 08:00:00 GMT"
+
+    @pytest.mark.asyncio
+    async def test_http_error_raises(self):
+        """Test non-2xx responses raise httpx.HTTPStatusError."""
+        async with _client(lambda request: httpx.Response(503)) as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await fetch_feed("https://feeds.example.com/rss", client)
+
+
+class TestConditionalRequests:
+    """Tests for ETag/Last-Modified conditional GETs."""
+
+    @pytest.mark.asyncio
+    async def test_validators_sent_as_conditional_headers(self):
+        """Test etag/modified become If-None-Match/If-Modified-Since."""
+        seen = {}
+
+        def handler(request):
+            seen.update(request.headers)
+            return httpx.Response(200, content=RSS_BODY)
+
+        async with _client(handler) as client:
+            await fetch_feed(
+                "https://feeds.example.com/rss", client,
+                etag='"v1"', modified="Wed, 14 Oct 2026 08:00:00 GMT"
+            )
+
+        assert seen["if-none-match"] == '"v1"'
+        assert seen["if-modified-since"] == "Wed, 14 Oct 2026 08:00:00 GMT"
+
+    @pytest.mark.asyncio
+    async def test_no_conditional_headers_without_validators(self):
+        """Test a first download is unconditional."""
+        seen = {}
+
+        def handler(request):
+            seen.update(request.headers)
+            return httpx.Response(200, content=RSS_BODY)
+
+        async with _client(handler) as client:
+            await fetch_feed("https://feeds.example.com/rss", client)
+
+        assert "if-none-match" not in seen
+        assert "if-modified-since" not in seen
+
+    @pytest.mark.asyncio
+    async def test_not_modified(self):
+        """Test a 304 returns no entries and keeps the previous validators."""
+        async with _client(lambda request: httpx.Response(304)) as client:
+            feed = await fetch_feed(
+                "https://feeds.example.com/rss", client,
+                etag='"v1"', modified="Wed, 14 Oct 2026 08:00:00 GMT"
+            )
+
+        assert feed.status == 304
+        assert feed.entries == []
+        assert feed.bozo is False
+        assert feed.etag == '"v1"'
+        assert feed.modified == "Wed, 14 Oct 2026 08:00:00 GMT"
+
+
+class TestSizeCap:
+    """Tests for the MAX_FEED_BYTES response size cap."""
+
+    @pytest.mark.asyncio
+    async def test_oversized_feed_rejected(self):
+        """Test a body over MAX_FEED_BYTES raises ValueError."""
+        with patch.object(feed_fetcher, "MAX_FEED_BYTES", len(RSS_BODY) - 1):
+            async with _client(lambda request: httpx.Response(200, content=RSS_BODY)) as client:
+                with pytest.raises(ValueError):
+                    await fetch_feed("https://feeds.example.com/rss", client)
+
+    @pytest.mark.asyncio
+    async def test_feed_at_limit_accepted(self):
+        """Test a body of exactly MAX_FEED_BYTES is parsed."""
+        with patch.object(feed_fetcher, "MAX_FEED_BYTES", len(RSS_BODY)):
+            async with _client(lambda request: httpx.Response(200, content=RSS_BODY)) as client:
+                feed = await fetch_feed("https://feeds.example.com/rss", client)
+
+        assert len(feed.entries) == 2
+
+
+class TestRedirects:
+    """Tests for redirect validation."""
+
+    @pytest.mark.asyncio
+    async def test_public_redirect_followed(self):
+        """Test redirects to public hosts are followed."""
+        def handler(request):
+            if request.url.host == "feeds.example.com":
+                return httpx.Response(301, headers={"Location": "https://cdn.example.com/rss"})
+            return httpx.Response(200, content=RSS_BODY)
+
+        async with _client(handler) as client:
+            feed = await fetch_feed("https://feeds.example.com/rss", client)
+
+        assert len(feed.entries) == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("location", [
+        "http://169.254.169.254/latest/meta-data/",
+        "http://127.0.0.1:8000/admin",
+        "http://localhost/rss",
+        "file:///etc/passwd",
+    ])
+    async def test_non_public_redirect_refused(self, location):
+        """Test redirects to internal addresses or other schemes are never requested."""
+        requested = []
+
+        def handler(request):
+            requested.append(str(request.url))
+            if request.url.host == "feeds.example.com":
+                return httpx.Response(302, headers={"Location": location})
+            return httpx.Response(200, content=RSS_BODY)
+
+        async with _client(handler) as client:
+            with pytest.raises(ValueError):
+                await fetch_feed("https://feeds.example.com/rss", client)
+
+        assert requested == ["https://feeds.example.com/rss"]
+
+
+class TestIsPublicHost:
+    """Tests for is_public_host."""
+
+    def test_ip_literals(self):
+        """Test private, loopback and link-local addresses are not public."""
+        assert is_public_host("8.8.8.8") is True
+        assert is_public_host("10.0.0.1") is False
+        assert is_public_host("127.0.0.1") is False
+        assert is_public_host("169.254.169.254") is False
+        assert is_public_host("::1") is False
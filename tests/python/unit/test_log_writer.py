@@ -0,0 +1,259 @@
+"""
+Unit tests for the batched activity/audit log writer.
+
+Tests cover:
+- Rows written immediately when the flusher isn't running
+- Batching by table and flushing pending rows on stop()
+- Overflow policies (block, write, drop)
+- Database write failures (bulk failures retried row by row)
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from backend.python.middleware.log_writer import BatchedLogWriter
+
+
+class _StubGaiaSchema:
+    """
+    Stands in for supabase.schema('gaia'), recording every insert.
+
+    Inserts run in a worker thread (asyncio.to_thread), so an optional delay
+    keeps the flusher busy long enough for the queue to fill up.
+    """
+
+    def __init__(self, fail=False, delay=0.0, bad_rows=()):
+        self.fail = fail
+        self.delay = delay
+        self.bad_rows = list(bad_rows)
+        self.inserts = []
+
+    def from_(self, table):
+        return _StubInsert(self, table)
+
+
+class _StubInsert:
+    def __init__(self, schema, table):
+        self.schema = schema
+        self.table = table
+        self.rows = None
+
+    def insert(self, rows, returning=None, default_to_null=True):
+        assert default_to_null is False
+        self.rows = rows
+        return self
+
+    def execute(self):
+        if self.schema.delay:
+            time.sleep(self.schema.delay)
+        if self.schema.fail:
+            raise RuntimeError("database unavailable")
+        if any(row in self.schema.bad_rows for row in self.rows):
+            raise RuntimeError("invalid input syntax")
+        self.schema.inserts.append((self.table, list(self.rows)))
+
+
+@pytest.fixture
+def gaia():
+    """Stubbed gaia schema client"""
+    stub = _StubGaiaSchema()
+    with patch('backend.python.middleware.log_writer.gaia', stub):
+        yield stub
+
+
+def _written_rows(stub, table=None):
+    return [row for name, rows in stub.inserts if table in (None, name) for row in rows]
+
+
+class TestBatchedLogWriterInit:
+    """Tests for BatchedLogWriter construction."""
+
+    def test_invalid_overflow_policy(self):
+        """Test an unknown overflow policy is rejected."""
+        with pytest.raises(ValueError):
+            BatchedLogWriter(overflow_policy="discard")
+
+    def test_statistics_before_start(self):
+        """Test statistics report an idle writer."""
+        writer = BatchedLogWriter(max_pending=5, overflow_policy="drop")
+        stats = writer.get_statistics()
+        assert stats['running'] is False
+        assert stats['pending_rows'] == 0
+        assert stats['max_pending'] == 5
+        assert stats['overflow_policy'] == "drop"
+
+
+class TestBatchedLogWriterNotRunning:
+    """Tests for put() before start() / after stop()."""
+
+    @pytest.mark.asyncio
+    async def test_put_before_start_writes_immediately(self, gaia):
+        """Test rows are written straight away when the flusher isn't running."""
+        writer = BatchedLogWriter()
+        assert await writer.put("activity_logs", {"action": "login"}) is True
+        assert gaia.inserts == [("activity_logs", [{"action": "login"}])]
+
+    @pytest.mark.asyncio
+    async def test_put_before_start_reports_write_failure(self, gaia):
+        """Test a failed direct write returns False instead of raising."""
+        gaia.fail = True
+        writer = BatchedLogWriter()
+        assert await writer.put("activity_logs", {"action": "login"}) is False
+        assert gaia.inserts == []
+
+
+class TestBatchedLogWriterFlushing:
+    """Tests for batching and shutdown."""
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending_rows(self, gaia):
+        """Test stop() writes every queued row, one insert per table."""
+        writer = BatchedLogWriter(flush_interval=60)
+        writer.start()
+        for i in range(3):
+            assert await writer.put("activity_logs", {"n": i}) is True
+        assert await writer.put("audit_logs", {"n": 99}) is True
+
+        await writer.stop()
+
+        assert sorted(gaia.inserts) == [
+            ("activity_logs", [{"n": 0}, {"n": 1}, {"n": 2}]),
+            ("audit_logs", [{"n": 99}]),
+        ]
+        assert writer.running is False
+
+    @pytest.mark.asyncio
+    async def test_batches_respect_batch_max(self, gaia):
+        """Test no single insert exceeds batch_max rows."""
+        writer = BatchedLogWriter(batch_max=4, flush_interval=60)
+        writer.start()
+        for i in range(10):
+            await writer.put("activity_logs", {"n": i})
+            await asyncio.sleep(0)
+
+        await writer.stop()
+
+        assert [row["n"] for row in _written_rows(gaia)] == list(range(10))
+        assert all(len(rows) <= 4 for _, rows in gaia.inserts)
+
+    @pytest.mark.asyncio
+    async def test_flush_interval_writes_without_stop(self, gaia):
+        """Test queued rows are written once flush_interval has passed."""
+        writer = BatchedLogWriter(flush_interval=0.01)
+        writer.start()
+        await writer.put("activity_logs", {"n": 1})
+
+        for _ in range(100):
+            if gaia.inserts:
+                break
+            await asyncio.sleep(0.01)
+
+        assert gaia.inserts == [("activity_logs", [{"n": 1}])]
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_write_failure_does_not_stop_flusher(self, gaia):
+        """Test a failed bulk insert is logged and later rows are still written."""
+        writer = BatchedLogWriter(flush_interval=0.01)
+        writer.start()
+        gaia.fail = True
+        await writer.put("activity_logs", {"n": 1})
+        await asyncio.sleep(0.05)
+
+        gaia.fail = False
+        await writer.put("activity_logs", {"n": 2})
+        await writer.stop()
+
+        assert _written_rows(gaia) == [{"n": 2}]
+
+    @pytest.mark.asyncio
+    async def test_bad_row_does_not_lose_the_batch(self, gaia):
+        """Test a failed bulk insert is retried row by row, losing only the bad row."""
+        gaia.bad_rows = [{"n": 2}]
+        writer = BatchedLogWriter(flush_interval=60)
+        writer.start()
+        for i in range(5):
+            await writer.put("audit_logs", {"n": i})
+
+        await writer.stop()
+
+        assert _written_rows(gaia) == [{"n": 0}, {"n": 1}, {"n": 3}, {"n": 4}]
+        assert [len(rows) for _, rows in gaia.inserts] == [1, 1, 1, 1]
+
+    @pytest.mark.asyncio
+    async def test_direct_write_reports_partial_failure(self, gaia):
+        """Test _write returns False when any row could not be written."""
+        gaia.bad_rows = [{"n": 1}]
+        writer = BatchedLogWriter()
+        assert await writer._write("audit_logs", [{"n": 0}, {"n": 1}]) is False
+        assert _written_rows(gaia) == [{"n": 0}]
+
+
+class TestBatchedLogWriterOverflow:
+    """Tests for the overflow policies once max_pending rows are queued."""
+
+    @pytest.mark.asyncio
+    async def test_drop_policy(self, gaia):
+        """Test rows beyond max_pending are dropped and counted."""
+        writer = BatchedLogWriter(max_pending=2, flush_interval=60, overflow_policy="drop")
+        writer.start()
+        # put() doesn't yield while the queue has room, so the flusher
+        # can't drain it between these calls
+        results = [await writer.put("activity_logs", {"n": i}) for i in range(4)]
+
+        assert results == [True, True, False, False]
+        assert writer.get_statistics()['dropped_rows'] == 2
+
+        await writer.stop()
+        assert _written_rows(gaia) == [{"n": 0}, {"n": 1}]
+
+    @pytest.mark.asyncio
+    async def test_write_policy(self, gaia):
+        """Test rows beyond max_pending bypass the queue and are written directly."""
+        writer = BatchedLogWriter(max_pending=2, flush_interval=60, overflow_policy="write")
+        writer.start()
+        results = [await writer.put("activity_logs", {"n": i}) for i in range(3)]
+
+        assert results == [True, True, True]
+        assert writer.get_statistics()['overflow_writes'] == 1
+        assert gaia.inserts == [("activity_logs", [{"n": 2}])]
+
+        await writer.stop()
+        assert sorted(row["n"] for row in _written_rows(gaia)) == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_block_policy(self, gaia):
+        """Test put() waits for the flusher instead of losing rows."""
+        gaia.delay = 0.01
+        writer = BatchedLogWriter(batch_max=2, max_pending=2, flush_interval=60, overflow_policy="block")
+        writer.start()
+        for i in range(8):
+            assert await writer.put("activity_logs", {"n": i}) is True
+            # The queue keeps one extra slot for the stop() sentinel
+            assert writer.get_statistics()['pending_rows'] <= writer.max_pending + 1
+
+        await writer.stop()
+
+        assert [row["n"] for row in _written_rows(gaia)] == list(range(8))
+        stats = writer.get_statistics()
+        assert stats['dropped_rows'] == 0
+        assert stats['overflow_writes'] == 0
+        assert stats['blocked_puts'] > 0
+
+    @pytest.mark.asyncio
+    async def test_block_policy_warning_is_rate_limited(self, gaia, caplog):
+        """Test a full queue doesn't log a warning for every blocked put()."""
+        gaia.delay = 0.005
+        writer = BatchedLogWriter(batch_max=1, max_pending=1, flush_interval=60, overflow_policy="block")
+        writer.start()
+        with caplog.at_level("WARNING", logger="backend.python.middleware.log_writer"):
+            for i in range(20):
+                await writer.put("activity_logs", {"n": i})
+        await writer.stop()
+
+        warnings = [r for r in caplog.records if "waiting for flush" in r.getMessage()]
+        assert writer.blocked_puts > 1
+        assert len(warnings) == 1
@@ -0,0 +1,193 @@
+"""
+Unit tests for the Philippine administrative region mapping.
+
+Tests cover:
+- Exact and case-insensitive city/province lookups
+- Location normalization with region data
+- Region listing helpers
+- Shared record dicts and read-only mappings built at import
+"""
+
+import pytest
+
+from backend.python.philippine_regions import (
+    PHILIPPINE_ADMIN_MAPPING,
+    PROVINCE_TO_REGION,
+    REGION_TO_CITIES,
+    PROVINCE_TO_CITIES,
+    get_region_from_location,
+    get_region_by_province,
+    resolve_city,
+    resolve_province,
+    normalize_location_with_region,
+    get_all_regions,
+    get_cities_by_region,
+    get_provinces_by_region,
+    get_cities_by_province,
+)
+
+
+class TestGetRegionFromLocation:
+    """Tests for get_region_from_location."""
+
+    def test_exact_city(self):
+        """Test exact city name returns its record."""
+        result = get_region_from_location(city="Manila")
+        assert result == {"province": "Metro Manila", "region": "NCR", "region_name": "National Capital Region"}
+
+    def test_case_insensitive_city(self):
+        """Test city lookup ignores case and surrounding whitespace."""
+        assert get_region_from_location(city="  quezon CITY ") == PHILIPPINE_ADMIN_MAPPING["Quezon City"]
+
+    def test_case_insensitive_province(self):
+        """Test province lookup ignores case."""
+        assert get_region_from_location(province="BENGUET") == PROVINCE_TO_REGION["Benguet"]
+
+    def test_city_takes_priority_over_province(self):
+        """Test city match is used before the province."""
+        result = get_region_from_location(city="Baguio", province="Metro Manila")
+        assert result["region"] == "CAR"
+
+    def test_unknown_location(self):
+        """Test unknown names return None."""
+        assert get_region_from_location(city="Atlantis", province="Nowhere") is None
+        assert get_region_from_location() is None
+
+
+class TestResolveCity:
+    """Tests for resolve_city."""
+
+    def test_exact_name(self):
+        """Test exact names resolve to themselves."""
+        assert resolve_city("Manila") == "Manila"
+
+    def test_accent_and_case_insensitive(self):
+        """Test names without accents or in other casing resolve."""
+        assert resolve_city("paranaque") == "Parañaque"
+        assert resolve_city(" LAS PINAS ") == "Las Piñas"
+
+    def test_unknown_city(self):
+        """Test unknown names return None."""
+        assert resolve_city("Atlantis") is None
+
+    def test_region_lookup_uses_folded_names(self):
+        """Test get_region_from_location accepts unaccented city names."""
+        assert get_region_from_location(city="Paranaque")["region"] == "NCR"
+
+
+class TestResolveProvince:
+    """Tests for resolve_province."""
+
+    def test_case_insensitive(self):
+        """Test province names resolve regardless of case and whitespace."""
+        assert resolve_province(" ilocos NORTE ") == "Ilocos Norte"
+
+    def test_unknown_province(self):
+        """Test unknown names return None."""
+        assert resolve_province("Nowhere") is None
+
+
+class TestGetRegionByProvince:
+    """Tests for get_region_by_province."""
+
+    def test_case_insensitive(self):
+        """Test province lookup ignores case and surrounding whitespace."""
+        assert get_region_by_province(" ilocos norte ") == {"region": "Region I", "region_name": "Ilocos Region"}
+
+    def test_unknown_province(self):
+        """Test unknown provinces return None."""
+        assert get_region_by_province("Nowhere") is None
+
+    def test_repeated_lookup_is_cached(self):
+        """Test repeated lookups are served from the cache."""
+        get_region_by_province.cache_clear()
+        first = get_region_by_province("Cebu")
+        assert get_region_by_province("Cebu") is first
+        assert get_region_by_province.cache_info().hits == 1
+
+    def test_every_city_province_is_indexed(self):
+        """Test every province used by a city entry has a region record."""
+        for data in PHILIPPINE_ADMIN_MAPPING.values():
+            assert get_region_by_province(data["province"]) is not None
+
+
+class TestNormalizeLocationWithRegion:
+    """Tests for normalize_location_with_region."""
+
+    def test_fills_province_from_city(self):
+        """Test province is filled in when found via city."""
+        result = normalize_location_with_region("Makati", city="makati")
+        assert result == {
+            "location_name": "Makati",
+            "city": "makati",
+            "province": "Metro Manila",
+            "region": "NCR",
+            "region_name": "National Capital Region",
+        }
+
+    def test_unknown_location_has_no_region(self):
+        """Test unknown locations keep region fields empty."""
+        result = normalize_location_with_region("Atlantis", city="Atlantis")
+        assert result["region"] is None
+        assert result["region_name"] is None
+
+    def test_no_city_or_province(self):
+        """Test a bare location name returns empty region fields."""
+        result = normalize_location_with_region("Somewhere")
+        assert result == {
+            "location_name": "Somewhere",
+            "city": None,
+            "province": None,
+            "region": None,
+            "region_name": None,
+        }
+
+
+class TestRegionListings:
+    """Tests for region listing helpers."""
+
+    def test_cities_by_region_case_insensitive_and_sorted(self):
+        """Test cities are returned sorted for any region code casing."""
+        cities = get_cities_by_region("ncr")
+        assert "Manila" in cities
+        assert cities == sorted(cities)
+        assert cities == get_cities_by_region("NCR")
+
+    def test_region_to_cities_matches_listing(self):
+        """Test the reverse index agrees with get_cities_by_region."""
+        assert list(REGION_TO_CITIES["CAR"]) == get_cities_by_region("car")
+
+    def test_provinces_by_region(self):
+        """Test provinces are grouped by region."""
+        assert "Benguet" in get_provinces_by_region("CAR")
+        assert get_provinces_by_region("Unknown Region") == []
+
+    def test_cities_by_province(self):
+        """Test cities are grouped by province, case-insensitively."""
+        cities = get_cities_by_province("metro manila")
+        assert "Manila" in cities
+        assert cities == list(PROVINCE_TO_CITIES["Metro Manila"])
+        assert get_cities_by_province("Nowhere") == []
+
+    def test_listings_return_copies(self):
+        """Test callers can modify returned lists without affecting the index."""
+        get_cities_by_region("NCR").clear()
+        get_all_regions().clear()
+        assert get_cities_by_region("NCR")
+        assert "NCR" in get_all_regions()
+
+
+class TestSharedRecords:
+    """Tests for record sharing done at import."""
+
+    def test_identical_records_are_shared(self):
+        """Test cities with the same province/region share one dict."""
+        assert PHILIPPINE_ADMIN_MAPPING["Manila"] is PHILIPPINE_ADMIN_MAPPING["Pasig"]
+        assert PROVINCE_TO_REGION["Abra"] is PROVINCE_TO_REGION["Benguet"]
+
+    def test_public_mappings_are_read_only(self):
+        """Test the published mappings cannot be modified."""
+        with pytest.raises(TypeError):
+            PHILIPPINE_ADMIN_MAPPING["Atlantis"] = {}
+        with pytest.raises(TypeError):
+            PROVINCE_TO_REGION["Nowhere"] = {}
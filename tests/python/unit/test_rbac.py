@@ -0,0 +1,186 @@
+"""
+Unit tests for the RBAC authentication caches.
+
+Tests cover:
+- Per-token user cache hits and invalidate_user_cache()
+- Inactive accounts are rejected and not cached
+- In-memory role -> permissions map (used, reloaded when stale, RPC fallback)
+"""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from backend.python.middleware import rbac
+from backend.python.middleware.rbac import (
+    ROLE_PERMISSIONS_TTL,
+    UserRole,
+    get_current_user,
+    invalidate_user_cache,
+)
+
+
+def _credentials(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def _profile(role="validator", status="active", permissions=None):
+    return {
+        "role": role,
+        "status": status,
+        "full_name": "Juan Dela Cruz",
+        "organization": "NDRRMC",
+        "permissions": permissions,
+    }
+
+
+@pytest.fixture
+def backend():
+    """
+    Stub Supabase Auth and the gaia schema client.
+
+    Tokens look like "token-<user id>"; every user has the profile in
+    backend.profiles (default: active validator).
+    """
+    state = SimpleNamespace(
+        profiles={},
+        role_permissions=[
+            {"role": "validator", "permission_name": "hazards.validate"},
+            {"role": "citizen", "permission_name": "reports.create"},
+        ],
+        role_permissions_fail=False,
+    )
+
+    def get_user(token):
+        user_id = token.split("-", 1)[1]
+        return SimpleNamespace(user=SimpleNamespace(id=user_id, email=f"{user_id}@example.com"))
+
+    def rpc(name, params):
+        assert name == "get_user_context"
+        profile = state.profiles.get(params["uid"], _profile())
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=[profile]))
+
+    def role_permissions_execute():
+        if state.role_permissions_fail:
+            raise RuntimeError("database unavailable")
+        return SimpleNamespace(data=state.role_permissions)
+
+    supabase = MagicMock()
+    supabase.auth.get_user.side_effect = get_user
+    gaia = MagicMock()
+    gaia.rpc.side_effect = rpc
+    gaia.from_.return_value.select.return_value.execute.side_effect = role_permissions_execute
+    state.supabase = supabase
+    state.gaia = gaia
+
+    with patch.object(rbac, "supabase", supabase), \
+            patch.object(rbac, "gaia", gaia), \
+            patch.object(rbac, "_role_permissions", {}), \
+            patch.object(rbac, "_role_permissions_loaded_at", None):
+        rbac._user_cache.clear()
+        yield state
+        rbac._user_cache.clear()
+
+
+class TestUserCache:
+    """Tests for the per-token authentication cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_token_is_served_from_cache(self, backend):
+        """Test a second request with the same token skips Supabase."""
+        first = await get_current_user(_credentials("token-u1"))
+        second = await get_current_user(_credentials("token-u1"))
+
+        assert first.user_id == second.user_id == "u1"
+        assert second.role == UserRole.VALIDATOR
+        assert backend.supabase.auth.get_user.call_count == 1
+        assert backend.gaia.rpc.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_single_user(self, backend):
+        """Test invalidating one user keeps other users cached."""
+        await get_current_user(_credentials("token-u1"))
+        await get_current_user(_credentials("token-u2"))
+
+        backend.profiles["u1"] = _profile(role="citizen")
+        invalidate_user_cache("u1")
+
+        assert (await get_current_user(_credentials("token-u1"))).role == UserRole.CITIZEN
+        await get_current_user(_credentials("token-u2"))
+        assert backend.supabase.auth.get_user.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_invalidate_all_users(self, backend):
+        """Test invalidate_user_cache() without a user clears every entry."""
+        await get_current_user(_credentials("token-u1"))
+        await get_current_user(_credentials("token-u2"))
+
+        invalidate_user_cache()
+
+        await get_current_user(_credentials("token-u1"))
+        await get_current_user(_credentials("token-u2"))
+        assert backend.supabase.auth.get_user.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_inactive_user_is_rejected_and_not_cached(self, backend):
+        """Test a deactivated account gets 403 on every request."""
+        backend.profiles["u1"] = _profile(status="suspended")
+
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc_info:
+                await get_current_user(_credentials("token-u1"))
+            assert exc_info.value.status_code == 403
+
+        assert backend.gaia.rpc.call_count == 2
+
+    def test_cache_ttl_is_short(self):
+        """Test cached role/status can't outlive a deactivation by more than a few seconds."""
+        assert rbac._user_cache.ttl == rbac.USER_CACHE_TTL <= 10
+
+
+class TestRolePermissionsMap:
+    """Tests for the in-memory role -> permissions map."""
+
+    @pytest.mark.asyncio
+    async def test_permissions_come_from_role_map(self, backend):
+        """Test the RPC is asked to skip the permissions join while the map is loaded."""
+        user = await get_current_user(_credentials("token-u1"))
+
+        assert user.permissions == frozenset({"hazards.validate"})
+        _, params = backend.gaia.rpc.call_args.args
+        assert params["include_permissions"] is False
+
+    @pytest.mark.asyncio
+    async def test_role_map_is_loaded_once(self, backend):
+        """Test the map is reused across users until it expires."""
+        await get_current_user(_credentials("token-u1"))
+        await get_current_user(_credentials("token-u2"))
+
+        assert backend.gaia.from_.return_value.select.return_value.execute.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_role_map_is_reloaded(self, backend):
+        """Test the map is reloaded once older than ROLE_PERMISSIONS_TTL."""
+        await get_current_user(_credentials("token-u1"))
+        backend.role_permissions = [{"role": "validator", "permission_name": "hazards.delete"}]
+        rbac._role_permissions_loaded_at = time.monotonic() - ROLE_PERMISSIONS_TTL - 1
+
+        user = await get_current_user(_credentials("token-u2"))
+
+        assert user.permissions == frozenset({"hazards.delete"})
+
+    @pytest.mark.asyncio
+    async def test_rpc_permissions_used_when_map_unavailable(self, backend):
+        """Test permissions come from the RPC when role_permissions can't be read."""
+        backend.role_permissions_fail = True
+        backend.profiles["u1"] = _profile(permissions=["hazards.validate", "hazards.view"])
+
+        user = await get_current_user(_credentials("token-u1"))
+
+        assert user.permissions == frozenset({"hazards.validate", "hazards.view"})
+        _, params = backend.gaia.rpc.call_args.args
+        assert params["include_permissions"] is True
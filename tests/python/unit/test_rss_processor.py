@@ -0,0 +1,46 @@
+"""
+Unit tests for the RSS processor's HTML cleanup.
+
+Tests cover:
+- Tags stripped and whitespace collapsed
+- CDATA-wrapped summaries (common in RSS descriptions)
+- Script/style content removed
+"""
+
+import pytest
+
+from backend.python.pipeline.rss_processor import RSSProcessor
+
+
+@pytest.fixture
+def processor():
+    """Processor instance"""
+    return RSSProcessor()
+
+
+class TestCleanHtml:
+    """Tests for RSSProcessor._clean_html."""
+
+    def test_strips_tags_and_whitespace(self, processor):
+        """Test markup is removed and whitespace collapsed."""
+        assert processor._clean_html("<p>Flood  in\n<b>Manila</b></p>") == "Flood in Manila"
+
+    def test_empty_input(self, processor):
+        """Test empty or missing HTML gives an empty string."""
+        assert processor._clean_html("") == ""
+        assert processor._clean_html(None) == ""
+
+    def test_cdata_only_summary(self, processor):
+        """Test a summary that is entirely CDATA keeps its text."""
+        assert processor._clean_html("<![CDATA[Typhoon Signal No. 3 raised over Samar]]>") == \
+            "Typhoon Signal No. 3 raised over Samar"
+
+    def test_cdata_with_markup(self, processor):
+        """Test markup inside CDATA is stripped like any other markup."""
+        html = "<p>Update:</p><![CDATA[<b>Flooding</b> in <i>Marikina</i>]]> continues"
+        assert processor._clean_html(html) == "Update: Flooding in Marikina continues"
+
+    def test_script_and_style_removed(self, processor):
+        """Test code that isn't article text is dropped."""
+        html = "<style>p{color:red}</style><p>Landslide in Benguet</p><script>track()</script>"
+        assert processor._clean_html(html) == "Landslide in Benguet"
@@ -0,0 +1,629 @@
+"""
+Unit tests for the enhanced RSS processor.
+
+Tests cover:
+- HTML cleanup, including CDATA-wrapped summaries
+- Bulk insert: all rows inserted
+- Rows skipped as source_url conflicts
+- Rows without a source_url (NULL never conflicts)
+- Bulk insert failure followed by per-row retry
+- The classify/store feed pipeline: result and insert order, the
+  published-date boundary, and how download, insert and store-stage
+  failures reach the caller
+- Duplicate index prefetch (chunked IN queries, lookup failures)
+- Loading and saving gaia.rss_feed_state
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import feedparser
+import pytest
+
+from backend.python.pipeline import rss_processor_enhanced
+from backend.python.pipeline.rss_processor_enhanced import RSSProcessorEnhanced
+
+
+class _StubHazardsTable:
+    """
+    Stands in for supabase.schema('gaia').from_('hazards').
+
+    upsert(..., ignore_duplicates=True) behaves like INSERT ... ON CONFLICT
+    (source_url) DO NOTHING: rows whose source_url is already stored are left
+    out of the response, NULL source_urls never conflict.
+    """
+
+    def __init__(self, existing_urls=(), fail_bulk=False, bad_urls=()):
+        self.stored_urls = set(existing_urls)
+        self.fail_bulk = fail_bulk
+        self.bad_urls = set(bad_urls)
+        self.requests = []
+        self._pending = None
+        self._next_id = 0
+
+    def upsert(self, rows, on_conflict=None, ignore_duplicates=False):
+        assert on_conflict == 'source_url'
+        assert ignore_duplicates is True
+        self.requests.append([row['source_url'] for row in rows])
+        self._pending = rows
+        return self
+
+    def execute(self):
+        rows, self._pending = self._pending, None
+        if self.fail_bulk and len(rows) > 1:
+            raise RuntimeError("bulk insert failed")
+        if any(row['source_url'] in self.bad_urls for row in rows):
+            raise RuntimeError("invalid row")
+
+        inserted = []
+        for row in rows:
+            url = row['source_url']
+            if url is not None and url in self.stored_urls:
+                continue
+            if url is not None:
+                self.stored_urls.add(url)
+            self._next_id += 1
+            inserted.append({**row, 'id': f"hazard-{self._next_id}"})
+        return SimpleNamespace(data=inserted)
+
+
+@pytest.fixture
+def processor():
+    """Processor instance (the database client is stubbed per test)"""
+    return RSSProcessorEnhanced()
+
+
+def _flush(processor, table, rows):
+    """Run _flush_hazards against a stubbed gaia.hazards table"""
+    with patch('backend.python.pipeline.rss_processor_enhanced.supabase') as mock_supabase:
+        mock_supabase.schema.return_value.from_.return_value = table
+        return processor._flush_hazards(rows)
+
+
+def _rows(*urls):
+    return [{'source_url': url, 'title': f"Hazard {i}"} for i, url in enumerate(urls)]
+
+
+class TestCleanHtml:
+    """Tests for RSSProcessorEnhanced._clean_html."""
+
+    def test_strips_tags_and_whitespace(self, processor):
+        """Test markup is removed and whitespace collapsed."""
+        assert processor._clean_html("<p>Flood  in\n<b>Manila</b></p>") == "Flood in Manila"
+
+    def test_cdata_only_summary(self, processor):
+        """Test a summary that is entirely CDATA keeps its text."""
+        assert processor._clean_html("<![CDATA[Magnitude 6.1 quake hits Davao Oriental]]>") == \
+            "Magnitude 6.1 quake hits Davao Oriental"
+
+    def test_cdata_with_markup(self, processor):
+        """Test markup inside CDATA is stripped like any other markup."""
+        html = "<![CDATA[<p>Taal <b>eruption</b> alert raised</p>]]>"
+        assert processor._clean_html(html) == "Taal eruption alert raised"
+
+    def test_script_and_style_removed(self, processor):
+        """Test code that isn't article text is dropped."""
+        html = "<p>Evacuation in Albay</p><script>alert(1)</script><style>p{}</style>"
+        assert processor._clean_html(html) == "Evacuation in Albay"
+
+
+class TestFlushHazards:
+    """Tests for RSSProcessorEnhanced._flush_hazards."""
+
+    def test_all_rows_inserted(self, processor):
+        """Test every row gets its new id with a single request."""
+        table = _StubHazardsTable()
+
+        results = _flush(processor, table, _rows('https://a', 'https://b', 'https://c'))
+
+        assert results == [('hazard-1', False), ('hazard-2', False), ('hazard-3', False)]
+        assert len(table.requests) == 1
+
+    def test_conflicting_rows_reported_as_stored(self, processor):
+        """Test rows skipped by ON CONFLICT are marked already stored."""
+        table = _StubHazardsTable(existing_urls={'https://a', 'https://c'})
+
+        results = _flush(processor, table, _rows('https://a', 'https://b', 'https://c', 'https://d'))
+
+        assert results == [
+            (None, True),
+            ('hazard-1', False),
+            (None, True),
+            ('hazard-2', False),
+        ]
+        assert len(table.requests) == 1
+
+    def test_null_source_urls_are_inserted(self, processor):
+        """Test rows without a source_url are inserted and matched in order."""
+        table = _StubHazardsTable(existing_urls={'https://a'})
+
+        results = _flush(processor, table, _rows(None, 'https://a', None, 'https://b'))
+
+        assert results == [
+            ('hazard-1', False),
+            (None, True),
+            ('hazard-2', False),
+            ('hazard-3', False),
+        ]
+
+    def test_bulk_failure_retries_each_row(self, processor):
+        """Test a failed bulk insert falls back to one request per row."""
+        table = _StubHazardsTable(existing_urls={'https://b'}, fail_bulk=True)
+
+        results = _flush(processor, table, _rows('https://a', 'https://b', None))
+
+        assert results == [('hazard-1', False), (None, True), ('hazard-2', False)]
+        assert table.requests == [
+            ['https://a', 'https://b', None],
+            ['https://a'],
+            ['https://b'],
+            [None],
+        ]
+
+    def test_bad_row_does_not_lose_the_rest(self, processor):
+        """Test a row that fails on its own is reported as not stored."""
+        table = _StubHazardsTable(bad_urls={'https://b'})
+
+        results = _flush(processor, table, _rows('https://a', 'https://b', 'https://c'))
+
+        assert results == [('hazard-1', False), (None, False), ('hazard-2', False)]
+
+    def test_mismatched_response_retries_each_row(self, processor):
+        """Test a response that can't be mapped back to the rows is retried per row."""
+        table = _StubHazardsTable()
+        original_execute = table.execute
+        calls = []
+
+        def execute():
+            response = original_execute()
+            calls.append(len(response.data))
+            if len(calls) == 1:
+                response.data.append({'id': 'unexpected', 'source_url': 'https://other'})
+            return response
+
+        table.execute = execute
+
+        results = _flush(processor, table, _rows('https://a', 'https://b'))
+
+        # The first request already stored both rows, so the retries conflict
+        assert results == [(None, True), (None, True)]
+        assert len(table.requests) == 3
+
+
+class _StubGaia:
+    """
+    Stands in for supabase (schema 'gaia') with in-memory tables.
+
+    Supports the query shapes the processor uses: select() with in_/eq/gte/
+    limit filters, upsert() into hazards (ON CONFLICT (source_url) DO NOTHING)
+    and rss_feed_state (keyed by feed_url), and the find_nearby_hazard RPC,
+    which never finds a match. Tables listed in failing raise on execute().
+    """
+
+    def __init__(self):
+        self.tables = {'hazards': [], 'rss_feed_state': [], 'system_config': []}
+        self.failing = set()
+        self.in_queries = []
+        self._next_id = 0
+
+    def schema(self, name):
+        assert name == 'gaia'
+        return self
+
+    def from_(self, table):
+        return _StubQuery(self, table)
+
+    def rpc(self, name, params):
+        assert name == 'find_nearby_hazard'
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=None))
+
+    def new_id(self):
+        self._next_id += 1
+        return f"hazard-{self._next_id}"
+
+
+class _StubQuery:
+    def __init__(self, gaia, table):
+        self.gaia = gaia
+        self.table = table
+        self.filters = []
+        self.upserted = None
+        self.max_rows = None
+
+    def select(self, columns):
+        return self
+
+    def in_(self, column, values):
+        self.gaia.in_queries.append((self.table, column, list(values)))
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row[column] >= value)
+        return self
+
+    def limit(self, count):
+        self.max_rows = count
+        return self
+
+    def upsert(self, rows, on_conflict=None, ignore_duplicates=False):
+        self.upserted = rows
+        return self
+
+    def execute(self):
+        if self.table in self.gaia.failing:
+            raise RuntimeError(f"{self.table} unavailable")
+        rows = self.gaia.tables[self.table]
+
+        if self.upserted is None:
+            data = [dict(row) for row in rows if all(match(row) for match in self.filters)]
+            return SimpleNamespace(data=data[:self.max_rows])
+
+        if self.table == 'rss_feed_state':
+            state = self.upserted
+            rows[:] = [row for row in rows if row['feed_url'] != state['feed_url']] + [state]
+            return SimpleNamespace(data=[state])
+
+        stored_urls = {row['source_url'] for row in rows}
+        inserted = []
+        for row in self.upserted:
+            if row['source_url'] is not None and row['source_url'] in stored_urls:
+                continue
+            row = {**row, 'id': self.gaia.new_id()}
+            stored_urls.add(row['source_url'])
+            rows.append(row)
+            inserted.append(row)
+        return SimpleNamespace(data=inserted)
+
+
+# Geo-NER result per place name mentioned in an entry
+_PLACES = {
+    'Manila': (14.60, 120.98),
+    'Cebu': (10.31, 123.89),
+    'Davao': (7.07, 125.61),
+    'Iloilo': (10.72, 122.56),
+    'Baguio': (16.41, 120.60),
+}
+
+
+def _extract_locations(text):
+    return [
+        {'location_name': place, 'latitude': lat, 'longitude': lng}
+        for place, (lat, lng) in _PLACES.items() if place in text
+    ][:1]
+
+
+def _entry(place, published, link=None):
+    """Feed entry about flooding in place, published at an ISO 8601 time"""
+    return feedparser.FeedParserDict(
+        title=f"Flooding reported in {place}",
+        link=link or f"https://news.example.com/{place.lower()}",
+        summary=f"<p>Residents of {place} evacuated as flood waters rise.</p>",
+        published=published,
+    )
+
+
+def _feed(*entries, status=200, etag='"v2"'):
+    return feedparser.FeedParserDict(entries=list(entries), bozo=False, status=status, etag=etag)
+
+
+@pytest.fixture
+def pipeline():
+    """
+    Stub the database, the models and feed downloads of the processor.
+
+    Feeds are served from pipeline.feeds (a feed or an exception to raise),
+    after an optional per-feed pipeline.delays wait.
+    """
+    state = SimpleNamespace(
+        gaia=_StubGaia(),
+        feeds={},
+        delays={},
+        fetches=[],
+        cancelled=[],
+    )
+
+    async def fetch_feed(feed_url, client=None, etag=None, modified=None):
+        state.fetches.append((feed_url, etag, modified))
+        try:
+            await asyncio.sleep(state.delays.get(feed_url, 0))
+        except asyncio.CancelledError:
+            state.cancelled.append(feed_url)
+            raise
+        feed = state.feeds[feed_url]
+        if isinstance(feed, Exception):
+            raise feed
+        return feed
+
+    classifier = MagicMock()
+    classifier.classify.return_value = {'is_hazard': True, 'hazard_type': 'flooding', 'score': 0.9}
+    classifier.get_active_model.return_value = 'climate-nli-v1'
+    geo_ner = MagicMock()
+    geo_ner.extract_locations.side_effect = _extract_locations
+    state.classifier = classifier
+
+    with patch.multiple(
+        rss_processor_enhanced,
+        supabase=state.gaia,
+        classifier=classifier,
+        geo_ner=geo_ner,
+        fetch_feed=fetch_feed,
+    ):
+        yield state
+
+
+def _candidates(processor, *entries):
+    """(entry, content_data, classification, locations) tuples for entries"""
+    candidates = []
+    for entry in entries:
+        content_data = processor._extract_content(entry)
+        candidates.append((entry, content_data, {}, _extract_locations(content_data['text'])))
+    return candidates
+
+
+class TestProcessAllFeeds:
+    """Tests for the classify/store pipeline of process_all_feeds."""
+
+    @pytest.mark.asyncio
+    async def test_results_follow_feed_order(self, processor, pipeline):
+        """Test feeds are stored in configured order even if later ones download first."""
+        processor.feeds = ['https://a.example.com/rss', 'https://b.example.com/rss', 'https://c.example.com/rss']
+        pipeline.feeds = {
+            'https://a.example.com/rss': _feed(_entry('Manila', '2026-10-14T08:00:00+00:00')),
+            'https://b.example.com/rss': _feed(_entry('Cebu', '2026-10-14T08:00:00+00:00')),
+            'https://c.example.com/rss': _feed(_entry('Davao', '2026-10-14T08:00:00+00:00')),
+        }
+        pipeline.delays = {'https://a.example.com/rss': 0.03, 'https://b.example.com/rss': 0.02}
+
+        results = await processor.process_all_feeds()
+
+        assert [result['feed_url'] for result in results] == processor.feeds
+        assert [result['items_added'] for result in results] == [1, 1, 1]
+        assert [row['source'] for row in pipeline.gaia.tables['hazards']] == processor.feeds
+        assert processor.stats['total_stored'] == 3
+
+    @pytest.mark.asyncio
+    async def test_later_feed_sees_hazards_of_earlier_feed(self, processor, pipeline):
+        """Test an article stored for one feed is a duplicate in the next."""
+        processor.feeds = ['https://a.example.com/rss', 'https://b.example.com/rss']
+        shared = 'https://news.example.com/manila-flood'
+        pipeline.feeds = {
+            'https://a.example.com/rss': _feed(_entry('Manila', '2026-10-14T08:00:00+00:00', link=shared)),
+            'https://b.example.com/rss': _feed(_entry('Manila', '2026-10-14T08:00:00+00:00', link=shared)),
+        }
+
+        first, second = await processor.process_all_feeds()
+
+        assert (first['items_added'], first['duplicates_detected']) == (1, 0)
+        assert (second['items_added'], second['duplicates_detected']) == (0, 1)
+        assert len(pipeline.gaia.tables['hazards']) == 1
+
+    @pytest.mark.asyncio
+    async def test_entries_at_or_before_boundary_are_skipped(self, processor, pipeline):
+        """Test only entries newer than last_published_at are classified, and the boundary advances."""
+        feed_url = 'https://a.example.com/rss'
+        processor.feeds = [feed_url]
+        pipeline.gaia.tables['rss_feed_state'].append({
+            'feed_url': feed_url,
+            'etag': '"v1"',
+            'last_modified': None,
+            'last_published_at': '2026-10-14T16:00:00+08:00',
+        })
+        pipeline.feeds = {feed_url: _feed(
+            _entry('Manila', '2026-10-14T07:00:00+00:00'),
+            _entry('Cebu', '2026-10-14T08:00:00+00:00'),
+            _entry('Davao', '2026-10-14T09:00:00+00:00'),
+        )}
+
+        [result] = await processor.process_all_feeds()
+
+        assert pipeline.fetches == [(feed_url, '"v1"', None)]
+        assert result['items_processed'] == 1
+        assert [hazard['title'] for hazard in result['hazards_saved']] == ['Flooding reported in Davao']
+        assert pipeline.classifier.classify.call_count == 1
+        [state] = pipeline.gaia.tables['rss_feed_state']
+        assert state['etag'] == '"v2"'
+        assert state['last_published_at'] == '2026-10-14T09:00:00+00:00'
+
+    @pytest.mark.asyncio
+    async def test_unchanged_feed_keeps_state(self, processor, pipeline):
+        """Test a 304 classifies nothing and leaves the stored state alone."""
+        feed_url = 'https://a.example.com/rss'
+        processor.feeds = [feed_url]
+        stored = {
+            'feed_url': feed_url,
+            'etag': '"v1"',
+            'last_modified': None,
+            'last_published_at': '2026-10-14T08:00:00+00:00',
+        }
+        pipeline.gaia.tables['rss_feed_state'].append(dict(stored))
+        pipeline.feeds = {feed_url: _feed(status=304, etag='"v1"')}
+
+        [result] = await processor.process_all_feeds()
+
+        assert result['status'] == 'success'
+        assert result['items_processed'] == 0
+        pipeline.classifier.classify.assert_not_called()
+        assert pipeline.gaia.tables['rss_feed_state'] == [stored]
+
+    @pytest.mark.asyncio
+    async def test_failed_download_reported_per_feed(self, processor, pipeline):
+        """Test a feed that can't be downloaded is an error result, not a failed run."""
+        processor.feeds = ['https://a.example.com/rss', 'https://b.example.com/rss']
+        pipeline.feeds = {
+            'https://a.example.com/rss': ValueError("feed too large"),
+            'https://b.example.com/rss': _feed(_entry('Cebu', '2026-10-14T08:00:00+00:00')),
+        }
+
+        first, second = await processor.process_all_feeds()
+
+        assert first['status'] == 'error'
+        assert first['error_message'] == "feed too large"
+        assert second['status'] == 'success'
+        assert second['items_added'] == 1
+        assert [state['feed_url'] for state in pipeline.gaia.tables['rss_feed_state']] == \
+            ['https://b.example.com/rss']
+
+    @pytest.mark.asyncio
+    async def test_failed_insert_keeps_previous_boundary(self, processor, pipeline):
+        """Test hazards that couldn't be stored are downloaded again on the next run."""
+        feed_url = 'https://a.example.com/rss'
+        processor.feeds = [feed_url]
+        pipeline.gaia.tables['rss_feed_state'].append({
+            'feed_url': feed_url,
+            'etag': '"v1"',
+            'last_modified': None,
+            'last_published_at': '2026-10-14T08:00:00+00:00',
+        })
+        pipeline.feeds = {feed_url: _feed(
+            _entry('Manila', '2026-10-14T09:00:00+00:00'),
+            _entry('Cebu', '2026-10-14T10:00:00+00:00'),
+        )}
+        original_flush = processor._flush_hazards
+
+        def flush_with_hazards_down(rows):
+            pipeline.gaia.failing.add('hazards')
+            try:
+                return original_flush(rows)
+            finally:
+                pipeline.gaia.failing.discard('hazards')
+
+        with patch.object(processor, '_flush_hazards', side_effect=flush_with_hazards_down):
+            [result] = await processor.process_all_feeds()
+
+        assert result['status'] == 'success'
+        assert result['items_added'] == 0
+        assert processor.stats['errors'] == 2
+        [state] = pipeline.gaia.tables['rss_feed_state']
+        assert state['etag'] is None
+        assert state['last_published_at'] == '2026-10-14T08:00:00+00:00'
+
+    @pytest.mark.asyncio
+    async def test_store_stage_exception_reaches_caller(self, processor, pipeline):
+        """Test an unexpected store-stage error is raised and pending downloads are cancelled."""
+        processor.feeds = ['https://a.example.com/rss', 'https://b.example.com/rss']
+        pipeline.feeds = {
+            'https://a.example.com/rss': _feed(_entry('Manila', '2026-10-14T08:00:00+00:00')),
+            'https://b.example.com/rss': _feed(_entry('Cebu', '2026-10-14T08:00:00+00:00')),
+        }
+        pipeline.delays = {'https://b.example.com/rss': 60}
+
+        with patch.object(processor, '_store_feed', side_effect=RuntimeError("connection reset")):
+            with pytest.raises(RuntimeError, match="connection reset"):
+                await asyncio.wait_for(processor.process_all_feeds(), timeout=5)
+
+        await asyncio.sleep(0)
+        assert pipeline.cancelled == ['https://b.example.com/rss']
+
+
+class TestPrefetchDuplicateIndex:
+    """Tests for RSSProcessorEnhanced._prefetch_duplicate_index."""
+
+    def test_known_urls_and_recent_hashes(self, processor, pipeline):
+        """Test stored URLs and content hashes inside the time window are returned."""
+        manila, cebu, davao = _candidates(
+            processor,
+            _entry('Manila', '2026-10-14T08:00:00+00:00'),
+            _entry('Cebu', '2026-10-14T08:00:00+00:00'),
+            _entry('Davao', '2026-10-14T08:00:00+00:00'),
+        )
+        now = datetime.now(timezone.utc)
+        pipeline.gaia.tables['hazards'] += [
+            {'id': 'h1', 'source_url': manila[1]['link'], 'content_hash': 'other',
+             'detected_at': (now - timedelta(days=30)).isoformat()},
+            {'id': 'h2', 'source_url': 'https://elsewhere.example.com/1',
+             'content_hash': processor._generate_content_hash(cebu[1]),
+             'detected_at': (now - timedelta(hours=1)).isoformat()},
+            {'id': 'h3', 'source_url': 'https://elsewhere.example.com/2',
+             'content_hash': processor._generate_content_hash(davao[1]),
+             'detected_at': (now - timedelta(hours=processor.duplicate_time_window + 1)).isoformat()},
+        ]
+
+        known_urls, known_hashes = processor._prefetch_duplicate_index([manila, cebu, davao])
+
+        assert known_urls == {manila[1]['link']: 'h1'}
+        assert known_hashes == {processor._generate_content_hash(cebu[1]): 'h2'}
+
+    def test_queries_are_chunked(self, processor, pipeline):
+        """Test keys are looked up DUPLICATE_PREFETCH_CHUNK at a time and empty links skipped."""
+        places = ['Manila', 'Cebu', 'Davao', 'Iloilo', 'Baguio']
+        entries = [_entry(place, '2026-10-14T08:00:00+00:00') for place in places]
+        entries[0]['link'] = ''
+
+        with patch.object(rss_processor_enhanced, 'DUPLICATE_PREFETCH_CHUNK', 2):
+            processor._prefetch_duplicate_index(_candidates(processor, *entries))
+
+        url_queries = [values for _, column, values in pipeline.gaia.in_queries if column == 'source_url']
+        hash_queries = [values for _, column, values in pipeline.gaia.in_queries if column == 'content_hash']
+        assert [len(values) for values in url_queries] == [2, 2]
+        assert '' not in sum(url_queries, [])
+        assert [len(values) for values in hash_queries] == [2, 2, 1]
+
+    def test_lookup_failure_returns_none(self, processor, pipeline):
+        """Test a failed lookup returns None so duplicates are checked per entry."""
+        pipeline.gaia.failing.add('hazards')
+
+        candidates = _candidates(processor, _entry('Manila', '2026-10-14T08:00:00+00:00'))
+
+        assert processor._prefetch_duplicate_index(candidates) is None
+
+
+class TestFeedState:
+    """Tests for loading and saving gaia.rss_feed_state."""
+
+    def test_load_parses_boundary_as_utc(self, processor, pipeline):
+        """Test last_published_at is returned as an aware UTC datetime."""
+        pipeline.gaia.tables['rss_feed_state'] += [
+            {'feed_url': 'https://a.example.com/rss', 'etag': '"v1"', 'last_modified': None,
+             'last_published_at': '2026-10-14T16:00:00+08:00'},
+            {'feed_url': 'https://b.example.com/rss', 'etag': None, 'last_modified': None,
+             'last_published_at': None},
+            {'feed_url': 'https://other.example.com/rss', 'etag': '"x"', 'last_modified': None,
+             'last_published_at': None},
+        ]
+
+        state = processor._load_feed_state([
+            'https://a.example.com/rss', 'https://b.example.com/rss', 'https://c.example.com/rss'
+        ])
+
+        assert set(state) == {'https://a.example.com/rss', 'https://b.example.com/rss'}
+        assert state['https://a.example.com/rss']['etag'] == '"v1"'
+        assert state['https://a.example.com/rss']['last_published_at'] == \
+            datetime(2026, 10, 14, 8, 0, tzinfo=timezone.utc)
+        assert state['https://b.example.com/rss']['last_published_at'] is None
+
+    def test_load_failure_returns_empty_state(self, processor, pipeline):
+        """Test a failed lookup means every feed is downloaded in full."""
+        pipeline.gaia.failing.add('rss_feed_state')
+
+        assert processor._load_feed_state(['https://a.example.com/rss']) == {}
+
+    def test_save_then_load(self, processor, pipeline):
+        """Test a saved state is read back unchanged and replaces the previous one."""
+        feed_url = 'https://a.example.com/rss'
+        published = datetime(2026, 10, 14, 9, 0, tzinfo=timezone.utc)
+
+        processor._save_feed_state(feed_url, '"v1"', None, None)
+        processor._save_feed_state(feed_url, '"v2"', 'Wed, 14 Oct 2026 09:00:00 GMT', published)
+
+        [row] = pipeline.gaia.tables['rss_feed_state']
+        assert row['last_published_at'] == '2026-10-14T09:00:00+00:00'
+        assert row['last_checked']
+        state = processor._load_feed_state([feed_url])[feed_url]
+        assert state['etag'] == '"v2"'
+        assert state['last_modified'] == 'Wed, 14 Oct 2026 09:00:00 GMT'
+        assert state['last_published_at'] == published
+
+    def test_save_failure_is_not_raised(self, processor, pipeline):
+        """Test a failed save is logged instead of failing the feed."""
+        pipeline.gaia.failing.add('rss_feed_state')
+
+        processor._save_feed_state('https://a.example.com/rss', '"v1"', None, None)
+
+        assert pipeline.gaia.tables['rss_feed_state'] == []